@@ -1,17 +1,17 @@
-from Players.Heuristic_Player import Heuristic_Player
-from Players.MCTS_Player import MCTS_Player
-from Players.Min_Max_Player import Min_Max_Player
-from Players.Neural_Player import Neural_Player
-from Players.Human_Player import Human_Player
-from Players.Random_Player import Random_Player
-from HeuristicNet import boards_based_training
+from PlayerFactory import create_player
+from Tournament import round_robin_pairings
 from GUI import BackgammonGameGUI
 from Constants import *
+from RandomStreams import make_rng, roll_dice
 import random
 
 class BackgammonGameManager:
-    def __init__(self, window, players, board=START_BOARD, on_complete=None):
+    def __init__(self, window, players, board=START_BOARD, on_complete=None, seed=GAME_SEED):
         self.window = window
+        # Every game draws its dice and its players' random choices from streams of this
+        # seed (see RandomStreams.make_rng), so a seeded tournament can be replayed
+        self.seed = seed
+        self.dice_rng = make_rng(seed, 0, "dice")
         self.players = players
         self.scores = [0] * len(self.players)
         self.current_game_index = 0  # Track the current game index
@@ -33,40 +33,18 @@ class BackgammonGameManager:
         self.start_next_game()
 
 
-    def initialize_players(self, i, j):
+    def initialize_players(self, i, j, game_index=0):
         # Create player instances with the shared board
-        self.black = self.parse_player(self.players[i], BLACK)
-        self.white = self.parse_player(self.players[j], WHITE)
+        self.black = self.parse_player(self.players[i], BLACK, make_rng(self.seed, game_index, BLACK))
+        self.white = self.parse_player(self.players[j], WHITE, make_rng(self.seed, game_index, WHITE))
 
-    def parse_player(self, player, color):
+    def parse_player(self, player, color, rng=None):
         """
-        Parse the player input to determine the type and ratios.
+        Parse the player input to determine the type and ratios (see PlayerFactory.create_player).
+
+        :param rng: random.Random for players that make random choices (Random and MCTS)
         """
-        if player == HUMAN:
-            return Human_Player(color, board=self.start_board) # Human player
-        elif player == RAND_AI:
-            return Random_Player(color, board=self.start_board)  # Random AI player
-        elif player == HEUR_AI:
-            return Heuristic_Player(color, board=self.start_board)
-        elif player == MIN_MAX_AI:
-            return Min_Max_Player(color, board=self.start_board)
-        elif player == MCTS_AI:
-            return MCTS_Player(color, board=self.start_board)
-        elif player == NEURAL_AI:
-            return Neural_Player(color, board=self.start_board)
-        elif isinstance(player, list):
-            if player[0] == HEUR_AI:
-                return Heuristic_Player(color, board=self.start_board, ratios=player[1])
-            elif player[0] == NEURAL_AI:
-                return Neural_Player(color, board=self.start_board, model_path=player[1])
-            elif player[0] == MCTS_AI:
-                return MCTS_Player(color, board=self.start_board, ratios=player[1], c=player[2])
-            elif player[0] == MIN_MAX_AI:
-                return Min_Max_Player(color, board=self.start_board, ratios=player[1], depth=player[2])
-            else:
-                raise ValueError("Invalid player input format")
-        else:
-            raise ValueError("Invalid player input format")
+        return create_player(player, color, self.start_board, rng)
 
     def start_next_game(self):
         if self.current_game_index < len(self.players) * (len(self.players) - 1) // 2:
@@ -74,9 +52,10 @@ class BackgammonGameManager:
             self.board = self.start_board.copy()
 
             self.black_idx, self.white_idx = self.get_player_indices(self.current_game_index)
+            self.dice_rng = make_rng(self.seed, self.current_game_index, "dice")
+            self.initialize_players(self.black_idx, self.white_idx, self.current_game_index)
             self.current_game_index += 1
 
-            self.initialize_players(self.black_idx, self.white_idx)
             self.start_game()
         else:
             # All games are completed
@@ -111,17 +90,12 @@ class BackgammonGameManager:
         self.prepare_turn()
 
     def get_player_indices(self, game_index):
-        # Calculate player indices for the current game using round-robin scheduling
-        num_players = len(self.players)
-        i = game_index % num_players
-        j = (game_index + i) % num_players
-        if i == j:
-            j = (j + 1) % num_players
-        return i, j
+        # Player indices (black, white) of the current game in round-robin order
+        return round_robin_pairings(len(self.players))[game_index]
 
     def roll(self):
         """Handles the dice roll for a human player and starts the turn timer."""
-        self.rolls = roll()
+        self.rolls = roll(self.dice_rng)
         
         if DEBUG_MODE:
             print(f"{self.current_player()} rolled: {self.rolls}")
@@ -268,6 +242,7 @@ class BackgammonGameManager:
             self.gui.disable_buttons()
 
             if (NETWORK_TRAINING):
+                from HeuristicNet import boards_based_training  # torch is only needed for training
                 boards_based_training(self.board_history)
 
             # Schedule the next game after a delay or end the session
@@ -306,11 +281,8 @@ class BackgammonGameManager:
     def reset_board_history(self):
         self.board_history = []
         self.current_board_index = -1
-def roll():
-    r = [random.randint(1,6), random.randint(1,6)]
-    if r[0] == r[1]:
-        r = [r[0], r[0], r[0], r[0]]
-    return r
+def roll(rng=random):
+    return roll_dice(rng)
 
 def generate_board(white_pieces, black_pieces):
     """Build a board array from two lists of point positions.
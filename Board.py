@@ -0,0 +1,220 @@
+import random
+from Constants import WHITE, BLACK, START_BOARD
+
+# Board layout (same as the 28-element list used everywhere else):
+# 0-23 points (white > 0, black < 0), 24/25 white/black captured, 26/27 white/black borne off
+WHITE_BAR, BLACK_BAR = 24, 25
+WHITE_OFF, BLACK_OFF = 26, 27
+
+WHITE_HOME_MASK = ((1 << 6) - 1) << 18  # points 18-23
+BLACK_HOME_MASK = (1 << 6) - 1          # points 0-5
+
+# Zobrist keys: one random 64-bit value per (slot, piece count), counts -15..15 stored at index count + 15.
+# A fixed seed keeps hashes identical across processes and runs.
+_zobrist_rng = random.Random(0x5EED)
+ZOBRIST_KEYS = [[_zobrist_rng.getrandbits(64) for _ in range(31)] for _ in range(28)]
+ZOBRIST_BLACK_TO_MOVE = _zobrist_rng.getrandbits(64)
+
+
+class Board:
+    """
+    Compact immutable board. The 28 slots are stored in a tuple and the derived
+    state below is computed once and then updated incrementally by apply():
+
+    - white_pips / black_pips: pip count (captured pieces count 25 pips)
+    - white_mask / black_mask: bit p is set when the color occupies point p
+    - white_blots / black_blots: bit p is set when the color has exactly one piece on p
+    - white_made / black_made: bit p is set when the color has two or more pieces on p
+    - white_home / black_home: True when every remaining piece is in the home board
+    - zobrist: Zobrist hash of the 28 slots (see position_hash for the side to move)
+
+    Indexing, len(), iteration and equality behave like the list format, so a Board
+    can be handed to code that only reads the board (e.g. evaluate_position).
+    """
+    __slots__ = (
+        "cells",
+        "white_pips", "black_pips",
+        "white_mask", "black_mask",
+        "white_blots", "black_blots",
+        "white_made", "black_made",
+        "white_home", "black_home",
+        "zobrist",
+    )
+
+    def __init__(self, board=START_BOARD):
+        """
+        Build a board from the 28-element list format.
+
+        :param board: The board state as a list (or any sequence of 28 ints).
+        """
+        self.cells = tuple(board)
+        self.white_pips = self.black_pips = 0
+        self.white_mask = self.black_mask = 0
+        self.white_blots = self.black_blots = 0
+        self.white_made = self.black_made = 0
+
+        for point in range(24):
+            count = self.cells[point]
+            if count > 0:
+                self.white_pips += count * (24 - point)
+            elif count < 0:
+                self.black_pips -= count * (point + 1)
+            self._set_point_bits(point, count)
+        self.white_pips += self.cells[WHITE_BAR] * 25
+        self.black_pips += self.cells[BLACK_BAR] * 25
+        self._update_home_flags()
+
+        self.zobrist = 0
+        for slot, count in enumerate(self.cells):
+            self.zobrist ^= ZOBRIST_KEYS[slot][count + 15]
+
+    def _set_point_bits(self, point, count):
+        bit = 1 << point
+        clear = ~bit
+        self.white_mask = (self.white_mask | bit) if count > 0 else (self.white_mask & clear)
+        self.black_mask = (self.black_mask | bit) if count < 0 else (self.black_mask & clear)
+        self.white_blots = (self.white_blots | bit) if count == 1 else (self.white_blots & clear)
+        self.black_blots = (self.black_blots | bit) if count == -1 else (self.black_blots & clear)
+        self.white_made = (self.white_made | bit) if count >= 2 else (self.white_made & clear)
+        self.black_made = (self.black_made | bit) if count <= -2 else (self.black_made & clear)
+
+    def _update_home_flags(self):
+        self.white_home = not (self.white_mask & ~WHITE_HOME_MASK) and self.cells[WHITE_BAR] == 0
+        self.black_home = not (self.black_mask & ~BLACK_HOME_MASK) and self.cells[BLACK_BAR] == 0
+
+    def apply(self, move, color):
+        """
+        Return a new board with a single (from_pos, to_pos) move played by color.
+        The move is assumed to be legal; hitting a blot on to_pos sends it to the bar.
+        """
+        from_pos, to_pos = move
+        cells = list(self.cells)
+        new = Board.__new__(Board)
+        new.white_pips, new.black_pips = self.white_pips, self.black_pips
+        new.white_mask, new.black_mask = self.white_mask, self.black_mask
+        new.white_blots, new.black_blots = self.white_blots, self.black_blots
+        new.white_made, new.black_made = self.white_made, self.black_made
+
+        if color == WHITE:
+            if from_pos == WHITE_BAR:
+                cells[WHITE_BAR] -= 1
+                new.white_pips -= 25
+            else:
+                cells[from_pos] -= 1
+                new.white_pips -= 24 - from_pos
+                new._set_point_bits(from_pos, cells[from_pos])
+
+            if to_pos == WHITE_OFF:
+                cells[WHITE_OFF] += 1
+            else:
+                if cells[to_pos] == -1:  # hit a black blot
+                    cells[to_pos] = 0
+                    cells[BLACK_BAR] += 1
+                    new.black_pips += 25 - (to_pos + 1)
+                cells[to_pos] += 1
+                new.white_pips += 24 - to_pos
+                new._set_point_bits(to_pos, cells[to_pos])
+        else:
+            if from_pos == BLACK_BAR:
+                cells[BLACK_BAR] -= 1
+                new.black_pips -= 25
+            else:
+                cells[from_pos] += 1
+                new.black_pips -= from_pos + 1
+                new._set_point_bits(from_pos, cells[from_pos])
+
+            if to_pos == BLACK_OFF:
+                cells[BLACK_OFF] += 1
+            else:
+                if cells[to_pos] == 1:  # hit a white blot
+                    cells[to_pos] = 0
+                    cells[WHITE_BAR] += 1
+                    new.white_pips += 25 - (24 - to_pos)
+                cells[to_pos] -= 1
+                new.black_pips += to_pos + 1
+                new._set_point_bits(to_pos, cells[to_pos])
+
+        # Only the source, destination and (after a hit) the opponent's bar changed
+        zobrist = self.zobrist
+        for slot in (from_pos, to_pos, BLACK_BAR if color == WHITE else WHITE_BAR):
+            if cells[slot] != self.cells[slot]:
+                keys = ZOBRIST_KEYS[slot]
+                zobrist ^= keys[self.cells[slot] + 15] ^ keys[cells[slot] + 15]
+        new.zobrist = zobrist
+
+        new.cells = tuple(cells)
+        new._update_home_flags()
+        return new
+
+    def apply_moves(self, moves, color):
+        """
+        Return a new board with a sequence of moves played by color.
+        """
+        board = self
+        for move in moves:
+            board = board.apply(move, color)
+        return board
+
+    # ------------------------------------------------------------ queries
+
+    def pip_count(self, color):
+        return self.white_pips if color == WHITE else self.black_pips
+
+    def occupancy(self, color):
+        return self.white_mask if color == WHITE else self.black_mask
+
+    def blots(self, color):
+        return self.white_blots if color == WHITE else self.black_blots
+
+    def made_points(self, color):
+        return self.white_made if color == WHITE else self.black_made
+
+    def all_home(self, color):
+        return self.white_home if color == WHITE else self.black_home
+
+    def captured(self, color):
+        return self.cells[WHITE_BAR if color == WHITE else BLACK_BAR]
+
+    def borne_off(self, color):
+        return self.cells[WHITE_OFF if color == WHITE else BLACK_OFF]
+
+    def is_blocked(self, point, color):
+        """
+        Check whether the opponent of color holds point with two or more pieces.
+        """
+        if point < 0 or point > 23:
+            return False
+        return bool((self.black_made if color == WHITE else self.white_made) >> point & 1)
+
+    def position_hash(self, color):
+        """
+        Zobrist hash of the board together with the side to move.
+        """
+        return self.zobrist ^ ZOBRIST_BLACK_TO_MOVE if color == BLACK else self.zobrist
+
+    def to_list(self):
+        return list(self.cells)
+
+    # ------------------------------------------------- list compatibility
+
+    def __getitem__(self, index):
+        return self.cells[index]
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __iter__(self):
+        return iter(self.cells)
+
+    def __eq__(self, other):
+        if isinstance(other, Board):
+            return self.cells == other.cells
+        if isinstance(other, list):
+            return self.cells == tuple(other)
+        return NotImplemented
+
+    def __hash__(self):
+        return self.zobrist
+
+    def __repr__(self):
+        return f"Board({list(self.cells)})"
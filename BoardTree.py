@@ -2,6 +2,13 @@ import math
 from Constants import MCTS_C, WHITE, BLACK
 
 
+def roll_key(roll):
+    """
+    Key of a roll among the 21 distinct ones: [5, 3] and [3, 5] give (3, 5), doubles (i, i, i, i).
+    """
+    return tuple(sorted(roll))
+
+
 class BoardNode:
     def __init__(self, board, evaluation, path, player_turn, visits=0, wins=0, parent=None): 
         """
@@ -34,10 +41,10 @@ class BoardNode:
         return self.terminal
     
     def is_fully_expanded(self, roll):
-        return tuple(sorted(roll)) in self.fully_expanded_rolls
+        return roll_key(roll) in self.fully_expanded_rolls
 
     def fully_expand_roll(self, roll):
-        self.fully_expanded_rolls.append(tuple(sorted(roll)))
+        self.fully_expanded_rolls.append(roll_key(roll))
     
     def get_evaluation(self):
         """
@@ -61,27 +68,32 @@ class BoardNode:
         self.wins += child_node.wins
         child_node.parent = self
 
-    def get_ucb(self, c=MCTS_C , direction = 1):
+    def get_ucb(self, c=MCTS_C , direction = 1, log_parent_visits=None):
         """
         Calculate the Upper Confidence Bound (UCB) for the node.
         
         :param c: The exploration parameter.
+        :param log_parent_visits: log(parent.visits) if already computed by the caller.
         """
         if self.visits == 0:
             return float("inf")
-        return direction * self.wins / self.visits + c * ((math.log(self.parent.visits) / self.visits) ** 0.5)
+        if log_parent_visits is None:
+            log_parent_visits = math.log(self.parent.visits)
+        return direction * self.wins / self.visits + c * ((log_parent_visits / self.visits) ** 0.5)
     
     def get_best_ucb_child(self, c= MCTS_C, direction = 1):
         """
         Get the child node with the highest UCB value.
+        The log of this node's visits is shared by all children and computed once.
         """
         if not self.children:
             return None
         
+        log_visits = math.log(self.visits) if self.visits > 0 else 0.0
         best_child = self.children[0]
         best_ucb = float("-inf")
         for child in self.children:
-            ucb = child.get_ucb(c , direction)
+            ucb = child.get_ucb(c , direction, log_visits)
             if ucb > best_ucb:
                 best_child , best_ucb = child , ucb
         return best_child
@@ -18,10 +18,29 @@ NEURAL_AI = "Neural_AI"
 HUMAN = "Human"
 
 # Game parameters
+GAME_SEED = None  # Seed for dice, random players and rollouts (None draws a fresh seed every run)
 START_BOARD = [2, 0, 0, 0, 0, -5, 0, -3, 0, 0, 0, 5, -5, 0, 0, 0, 3, 0, 5, 0, 0, 0, 0, -2, 0, 0, 0, 0]
 
 TURN_TIME = 60  # Default turn time limit in seconds
 AI_DELAY = 0  # Delay between AI moves in milliseconds
+TOURNAMENT_WORKERS = None  # Processes playing tournament games in parallel (None uses every CPU)
+WATCH_AI_GAMES = False  # Play AI-only tournaments on the board one game at a time instead of in the worker pool
+TOURNAMENT_GAMES_PER_PAIRING = 1  # Games per pair of players, alternating colors (at most, with a stop rule)
+STOP_SPRT = "sprt"              # Stop rules ending a pairing once its result is settled: sequential probability ratio test
+STOP_CONFIDENCE = "confidence"  # or a confidence interval on the win rate that excludes 50%
+TOURNAMENT_STOP_RULE = None     # (None plays every game)
+SPRT_DELTA = 0.1  # SPRT: decide between win rates 0.5 - DELTA and 0.5 + DELTA for the first player
+SPRT_ALPHA = 0.05  # SPRT error rates: wrongly favoring the first player / the second player
+SPRT_BETA = 0.05
+CONFIDENCE_Z = 1.96  # Confidence stop rule: interval half-width in standard errors (1.96 = 95%)
+CONFIDENCE_MIN_GAMES = 10  # Games a pairing plays before the confidence stop rule is checked
+
+# Rating parameters (Glicko ratings of bot configurations)
+RATING_INITIAL = 1500.0  # Rating of a new bot
+RATING_INITIAL_RD = 350.0  # Rating deviation (uncertainty) of a new bot
+RATING_MIN_RD = 30.0  # The deviation never shrinks below this
+RATING_RD_GROWTH = 0.0  # Deviation added (in quadrature) per rating round; 0 for bots that never change
+RATINGS_FILE = "ratings.json"  # Default file the rating table is kept in between runs
 
 # Gui parameters
 TRI_WIDTH = 50
@@ -33,13 +52,39 @@ LEARNING_RATE = 0.001
 EPOCHS_NUM = 20
 BOARD_SIZE = 28  # Board format length
 NUM_SAMPLES = 500 # Number of samples to generate for heuristic training
+MODEL_CACHE_SIZE = 4 # Maximum number of loaded models kept in memory
+SELF_PLAY_DIR = "SelfPlayData"  # Shards of self-play training records
+SELF_PLAY_PLAYER = NEURAL_AI  # Player spec both sides of self-play games use
+SELF_PLAY_WORKERS = None  # Processes playing self-play games (None uses every CPU)
+SHARD_RECORDS = 100000  # Positions per self-play shard file
+TRAIN_BATCH_SIZE = 4096  # Positions per SGD step when training from shards
 
 # Min-max parameters
 MIN_MAX_DEPTH = 1  # Default depth for min-max search
+MIN_MAX_ITERATIVE = True  # Deepen from 1 up to the chosen depth until AI_TURN_TIME runs out
+TT_SIZE = 200000  # Maximum number of positions kept in the min-max transposition table
 
 # MCST parameters
 MCTS_C = 1.4 # Exploration parameter for UCB
 AI_TURN_TIME = 2  # Default AI turn time limit in seconds
+ROLLOUT_RANDOM = "random"  # Rollout policies: uniformly random single-die moves,
+ROLLOUT_GREEDY = "greedy"  # the best move by a cheap pip/point/blot score,
+ROLLOUT_TOP_K = "top_k"    # or a random one of the MCTS_ROLLOUT_TOP_K best
+MCTS_ROLLOUT_POLICY = ROLLOUT_GREEDY
+MCTS_ROLLOUT_DEPTH = None  # Turns played per rollout before scoring with the heuristic (None plays to the end)
+MCTS_ROLLOUT_TOP_K = 3
+PRIOR_HEURISTIC = "heuristic"  # Move priors for MCTS expansion order: evaluate_position
+PRIOR_NEURAL = "neural"        # or the neural network (None keeps generation order)
+MCTS_PRIOR = PRIOR_HEURISTIC
+MCTS_WIDENING_K = 2.0  # Progressive widening: a roll seen n times searches its ceil(K * n ** ALPHA) best-prior moves
+MCTS_WIDENING_ALPHA = 0.5  # (K = None searches every move)
+LEAF_ROLLOUT = "rollout"  # MCTS leaf values: Monte Carlo rollouts
+LEAF_NEURAL = "neural"    # or the neural network, evaluated in batches
+MCTS_LEAF_EVALUATION = LEAF_ROLLOUT
+MCTS_BATCH_SIZE = 32  # Leaves queued before one batched network evaluation
+MCTS_BATCH_TIMEOUT = 0.01  # Seconds a queued leaf may wait before its batch is evaluated anyway
+MCTS_NODE_CAPACITY = 1 << 15  # Nodes preallocated by the MCTS node store (it doubles when full)
+MCTS_WORKERS = 1  # Processes searching in parallel from the root (1 searches in the game process)
 
 # Heuristic evaluation parameters
 CONSIDER_DICE_PROBABILITIES = False
@@ -1,11 +1,17 @@
-import msvcrt
+import os
+import time
 import torch
 import torch.nn as nn
 import torch.optim as optim
 import numpy as np
 import random
+from ModelRegistry import ModelRegistry
+from RandomStreams import make_rng
+from PositionRecords import network_inputs
+from HeuristicNetNumpy import export_weights
 from Eval_position import evaluate_position, win_based_evaluation
-from Constants import NETWORK_TRAINING, PATH, WHITE, BLACK, LEARNING_RATE, EPOCHS_NUM, BOARD_SIZE, NUM_SAMPLES
+from Constants import (NETWORK_TRAINING, PATH, WHITE, BLACK, LEARNING_RATE, EPOCHS_NUM, BOARD_SIZE, NUM_SAMPLES, GAME_SEED,
+                       SELF_PLAY_DIR, SHARD_RECORDS, TRAIN_BATCH_SIZE)
 
 
 # 1. Define the Neural Network
@@ -24,10 +30,10 @@ class HeuristicNet(nn.Module):
         return torch.sigmoid(x)  # Ensure output is between 0 and 1
 
 # Generate Random Boards and Heuristic Values
-def generate_data(NUM_SAMPLES, BOARD_SIZE, heuristic_func):
+def generate_data(NUM_SAMPLES, BOARD_SIZE, heuristic_func, rng=random):
     data = []
     for _ in range(NUM_SAMPLES):
-        board = generate_random_board(BOARD_SIZE)  # Generate random board
+        board = generate_random_board(BOARD_SIZE, rng)  # Generate random board
         value = heuristic_func(board) # Compute heuristic value
         data.append((board + [-1], 1 - value)) # Add board configuration and heuristic value as black
         data.append((board + [1], value)) # Add board configuration and heuristic value as white
@@ -57,10 +63,13 @@ def generate_data_from_boards(board_history):
         #data.append((board + [-1*  turn], 1-player_value))
     return data
 
-def generate_random_board(BOARD_SIZE):
+def generate_random_board(BOARD_SIZE, rng=random):
     """
     Generate a random board according to the described format and rules.
 
+    Args:
+        rng: Source of randomness (a random.Random, e.g. from RandomStreams.make_rng).
+
     Returns:
         list: A list representing the board configuration.
     """
@@ -71,19 +80,19 @@ def generate_random_board(BOARD_SIZE):
 
     # Assign random positive (white) and negative (black) pieces to positions 1-24
     positions = list(range(24))
-    random.shuffle(positions)
+    rng.shuffle(positions)
 
     white_remaining = total_pieces
     black_remaining = total_pieces
 
     for pos in positions:
         if white_remaining > 0 and black_remaining > 0:
-            white_count = random.randint(0, white_remaining)
-            black_count = random.randint(0, black_remaining)
+            white_count = rng.randint(0, white_remaining)
+            black_count = rng.randint(0, black_remaining)
 
             if white_count > 0 and black_count > 0:
                 # Ensure no mixed pieces in the same position
-                if random.choice([True, False]):
+                if rng.choice([True, False]):
                     black_count = 0
                 else:
                     white_count = 0
@@ -92,18 +101,18 @@ def generate_random_board(BOARD_SIZE):
             white_remaining -= white_count
             black_remaining -= black_count
         elif white_remaining > 0:
-            white_count = random.randint(0, white_remaining)
+            white_count = rng.randint(0, white_remaining)
             board[pos] = white_count
             white_remaining -= white_count
         elif black_remaining > 0:
-            black_count = random.randint(0, black_remaining)
+            black_count = rng.randint(0, black_remaining)
             board[pos] = -black_count
             black_remaining -= black_count
 
     # Set escaped and eaten pieces (indices 25-28)
-    board[24] = random.randint(0, white_remaining)  # Captured white
+    board[24] = rng.randint(0, white_remaining)  # Captured white
     white_remaining -= board[24]
-    board[25] = random.randint(0, black_remaining)  # Captured black
+    board[25] = rng.randint(0, black_remaining)  # Captured black
     black_remaining -= board[25]
     board[26] = total_pieces - white_remaining  # Escaped white
     board[27] = total_pieces - black_remaining  # Escaped black
@@ -138,6 +147,12 @@ def train_network(model, criterion, optimizer, data, epochs=EPOCHS_NUM, batch_si
     boards = torch.tensor(boards, dtype=torch.float32)
     values = torch.tensor(values, dtype=torch.float32).unsqueeze(1)  # Reshape to (N, 1)
 
+    return train_tensors(model, criterion, optimizer, boards, values, epochs, batch_size, val_data)
+
+def train_tensors(model, criterion, optimizer, boards, values, epochs=EPOCHS_NUM, batch_size=32, val_data=None):
+    """
+    Train the neural network on network inputs (N, BOARD_SIZE + 1) and targets (N, 1).
+    """
     dataset = torch.utils.data.TensorDataset(boards, values)
     dataloader = torch.utils.data.DataLoader(dataset, batch_size, shuffle=True)
 
@@ -163,6 +178,18 @@ def train_network(model, criterion, optimizer, data, epochs=EPOCHS_NUM, batch_si
 
     return model
 
+# Save a trained Network for the players
+def save_checkpoint(model, model_path=PATH):
+    """
+    Save the model's state dict to model_path and export its NumPy weights (see
+    HeuristicNetNumpy.export_weights). Both files are written under temporary names and
+    renamed when complete, and the weights only after the checkpoint, so players reloading
+    them while training runs never read a partial file.
+    """
+    torch.save(model.state_dict(), model_path + ".tmp")
+    os.replace(model_path + ".tmp", model_path)
+    return export_weights(model_path)
+
 # Train the Neural Network using boards
 def boards_based_training(board_history):
     # Step 1: load initial network
@@ -175,11 +202,60 @@ def boards_based_training(board_history):
     
     model = train_network(model, criterion, optimizer, generate_data_from_boards(board_history))
 
-    torch.save(model.state_dict(), PATH)
+    save_checkpoint(model, PATH)
     print("Training complete and model saved!")
 
+# Train the Neural Network from self-play shards
+def shard_training(directory=SELF_PLAY_DIR, model_path=PATH, epochs=EPOCHS_NUM, batch_size=TRAIN_BATCH_SIZE,
+                   min_records=SHARD_RECORDS):
+    """
+    Train on every completed self-play shard in directory (see SelfPlay.generate_self_play)
+    in large batches, save the checkpoint and its NumPy weights once, and move the shards
+    to the consumed subdirectory.
+
+    Args:
+        min_records (int): Do nothing until at least this many positions are waiting.
+
+    Returns:
+        int: The number of positions trained on.
+    """
+    from SelfPlay import ready_shards, load_shards, mark_consumed  # keeps the players out of this module's imports
+    paths = ready_shards(directory)
+    records = load_shards(paths)
+    if len(records) < min_records:
+        return 0
+
+    model = HeuristicNet(BOARD_SIZE)
+    model.load_state_dict(torch.load(model_path, weights_only=True))
+    criterion = nn.MSELoss()
+    optimizer = optim.Adam(model.parameters(), lr=LEARNING_RATE)
+
+    inputs = torch.from_numpy(network_inputs(records))
+    values = torch.from_numpy(records["target"].astype(np.float32)).unsqueeze(1)
+    model = train_tensors(model, criterion, optimizer, inputs, values, epochs, batch_size)
+
+    save_checkpoint(model, model_path)  # Self-play workers load the NumPy weights
+    mark_consumed(paths, directory)
+    print(f"Trained on {len(records)} positions from {len(paths)} shards and saved {model_path}")
+    return len(records)
+
+def shard_training_loop(directory=SELF_PLAY_DIR, model_path=PATH, poll_seconds=30):
+    """
+    Keep training on new self-play shards as they arrive, until 'q' is pressed.
+    """
+    import msvcrt  # Windows console keys, only needed by the interactive loops
+    print(f"Waiting for shards in {directory}...")
+    while True:
+        if msvcrt.kbhit() and msvcrt.getch().lower() == b'q':
+            print("User requested to quit. Stopping training.")
+            break
+        if not shard_training(directory, model_path):
+            time.sleep(poll_seconds)
+
 # Iterations training Process
 def iter_training():
+    import msvcrt  # Windows console keys, only needed by the interactive loops
+
     # Step 1: load initial network
     model = HeuristicNet(BOARD_SIZE)
     model.load_state_dict(torch.load(PATH, weights_only=True))
@@ -201,15 +277,33 @@ def iter_training():
                 break
         # Perform your training or evaluation steps here
         print(f"\nIteration {current_iter}")
-        labeled_data = generate_data(NUM_SAMPLES=NUM_SAMPLES, BOARD_SIZE=BOARD_SIZE, heuristic_func=evaluate_position)
+        labeled_data = generate_data(NUM_SAMPLES=NUM_SAMPLES, BOARD_SIZE=BOARD_SIZE, heuristic_func=evaluate_position,
+                                     rng=make_rng(GAME_SEED, "training", current_iter))
         model = train_network(model, criterion, optimizer, labeled_data)
         current_iter += 1
     print(f"Completed {current_iter} iterations.")
 
-    torch.save(model.state_dict(), PATH)
+    save_checkpoint(model, PATH)
     print(f"Model saved to {PATH}!")
     print("Training complete!")
 
+def _load_model(model_path, device):
+    model = HeuristicNet(BOARD_SIZE).to(device)
+    model.load_state_dict(torch.load(model_path, map_location=device, weights_only=False))
+    model.eval()
+    return model
+
+# Loaded models shared by every caller in the process
+DEVICE = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+MODEL_REGISTRY = ModelRegistry(_load_model)
+
+def load_model(model_path=PATH, device=DEVICE):
+    """
+    Return the trained model stored at model_path, loading it from disk only
+    the first time or after the file changed.
+    """
+    return MODEL_REGISTRY.get(model_path, device)
+
 def neural_eval(board, color, model_path=PATH):
     """
     Evaluate a board configuration using a trained model.
@@ -222,16 +316,35 @@ def neural_eval(board, color, model_path=PATH):
     Returns:
         float: The evaluation score between 0 and 1 (favoring the player as score approaches 1).
     """
-    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-    model = HeuristicNet(BOARD_SIZE).to(device)
-    model.load_state_dict(torch.load(model_path, map_location=device, weights_only=False))
-    model.eval()
+    model = load_model(model_path)
 
     with torch.no_grad():
-        x = torch.tensor(board + [1 if color == WHITE else -1], dtype=torch.float32, device=device)
+        x = torch.tensor(board + [1 if color == WHITE else -1], dtype=torch.float32, device=DEVICE)
         x = x.unsqueeze(0)  # Add batch dimension
         prediction = model(x)
     return prediction.item()
+
+def neural_eval_batch(boards, color, model_path=PATH):
+    """
+    Evaluate many board configurations with a single forward pass.
+
+    Args:
+        boards (list): Board configurations (each of length BOARD_SIZE).
+        color (str): The player the scores are computed for.
+        model_path (str): Path to the trained model.
+
+    Returns:
+        list: One evaluation score between 0 and 1 per board, in the same order.
+    """
+    if not boards:
+        return []
+    model = load_model(model_path)
+    turn = 1 if color == WHITE else -1
+
+    with torch.no_grad():
+        x = torch.tensor([list(board) + [turn] for board in boards], dtype=torch.float32, device=DEVICE)
+        predictions = model(x)
+    return predictions.squeeze(1).tolist()
    
 # Main function
 
@@ -0,0 +1,131 @@
+import os
+import importlib.util
+import warnings
+import numpy as np
+from ModelRegistry import ModelRegistry
+from Constants import PATH, WHITE
+
+# Torch is only needed to export a .pth checkpoint; playing runs on the .npz weights
+TORCH_AVAILABLE = importlib.util.find_spec("torch") is not None
+LAYERS = ("fc1", "fc2", "output")
+
+
+class NumpyHeuristicNet:
+    def __init__(self, weights):
+        """
+        Inference-only copy of HeuristicNet (29-40-40-1, ReLU, ReLU, sigmoid).
+
+        :param weights: Mapping with the HeuristicNet state dict entries as arrays.
+        """
+        # Weights are stored transposed so a batch of boards multiplies directly
+        self.layers = [
+            (np.ascontiguousarray(weights[f"{name}.weight"].T, dtype=np.float32),
+             np.asarray(weights[f"{name}.bias"], dtype=np.float32))
+            for name in LAYERS
+        ]
+
+    def forward(self, x):
+        """
+        Run the network on a (N, BOARD_SIZE + 1) batch and return N scores in [0, 1].
+        """
+        (w1, b1), (w2, b2), (w3, b3) = self.layers
+        x = np.maximum(x @ w1 + b1, 0.0)
+        x = np.maximum(x @ w2 + b2, 0.0)
+        x = x @ w3 + b3
+        # Numerically stable sigmoid
+        return np.exp(-np.logaddexp(0.0, -x[:, 0]))
+
+
+def weights_path(model_path):
+    """
+    Return the .npz weight file that belongs to a .pth checkpoint.
+    """
+    return os.path.splitext(model_path)[0] + ".npz"
+
+def export_weights(model_path=PATH, npz_path=None):
+    """
+    Export a trained HeuristicNet checkpoint to a compact .npz weight file.
+    This is the only function in the module that needs torch. The file is written
+    under a temporary name and renamed when complete, so a process loading the
+    weights never sees a partial file.
+
+    :param model_path: Path to the .pth state dict.
+    :param npz_path: Destination file, defaults to the checkpoint path with a .npz suffix.
+    :return: The path the weights were written to.
+    """
+    import torch
+
+    if npz_path is None:
+        npz_path = weights_path(model_path)
+    state_dict = torch.load(model_path, map_location="cpu", weights_only=True)
+    arrays = {key: value.numpy().astype(np.float32) for key, value in state_dict.items()}
+    with open(npz_path + ".tmp", "wb") as f:
+        np.savez(f, **arrays)
+    os.replace(npz_path + ".tmp", npz_path)
+    return npz_path
+
+def resolve_weights(model_path):
+    """
+    Return the .npz file for model_path, exporting it first if it is missing (needs torch).
+    An existing file is never rewritten here: code that saves a checkpoint exports it
+    (HeuristicNet.save_checkpoint), and an .npz older than its checkpoint only gives a warning.
+    """
+    if model_path.endswith(".npz"):
+        return model_path
+
+    npz_path = weights_path(model_path)
+    if not os.path.exists(npz_path):
+        if not TORCH_AVAILABLE:
+            raise FileNotFoundError(f"No exported weights at {npz_path} and torch is not installed to create them.")
+        export_weights(model_path, npz_path)
+    elif os.path.exists(model_path) and os.path.getmtime(npz_path) < os.path.getmtime(model_path):
+        warnings.warn(f"{npz_path} is older than {model_path}; run HeuristicNetNumpy.py to re-export it.")
+    return npz_path
+
+def _load_weights(npz_path, device):
+    with np.load(npz_path) as weights:
+        return NumpyHeuristicNet(weights)
+
+# Loaded weights shared by every caller in the process
+MODEL_REGISTRY = ModelRegistry(_load_weights)
+
+def load_model(model_path=PATH):
+    """
+    Return the inference network for model_path (.pth or .npz).
+    """
+    return MODEL_REGISTRY.get(resolve_weights(model_path), "numpy")
+
+def neural_eval_batch(boards, color, model_path=PATH):
+    """
+    Evaluate many board configurations with a single vectorized forward pass.
+
+    Args:
+        boards (list): Board configurations (each of length BOARD_SIZE).
+        color (str): The player the scores are computed for.
+        model_path (str): Path to the trained model (.pth or exported .npz).
+
+    Returns:
+        list: One evaluation score between 0 and 1 per board, in the same order.
+    """
+    if not len(boards):
+        return []
+    model = load_model(model_path)
+
+    x = np.empty((len(boards), len(boards[0]) + 1), dtype=np.float32)
+    x[:, :-1] = boards
+    x[:, -1] = 1 if color == WHITE else -1
+    return model.forward(x).tolist()
+
+def neural_eval(board, color, model_path=PATH):
+    """
+    Evaluate a single board configuration, see neural_eval_batch.
+    """
+    return neural_eval_batch([board], color, model_path)[0]
+
+
+if __name__ == "__main__":
+    # Export every checkpoint in HeuristicNets/ so they can be played without torch
+    import glob
+    base = os.path.dirname(os.path.abspath(__file__))
+    for checkpoint in sorted(glob.glob(os.path.join(base, "HeuristicNets", "*.pth"))):
+        print(f"Exported {export_weights(checkpoint)}")
@@ -0,0 +1,71 @@
+import time
+from Constants import *
+from Board import Board, WHITE_OFF, BLACK_OFF
+from PlayerFactory import create_player
+from RandomStreams import make_rng, roll_dice
+from Players.MCTS_Player import MCTS_Player
+from Players.Min_Max_Player import Min_Max_Player
+
+# Players whose choose_move accepts a time limit
+TIMED_PLAYERS = (MCTS_Player, Min_Max_Player)
+
+
+def play_match(white, black, seed=GAME_SEED, game_index=0, board=START_BOARD, turn_time=None, max_turns=None):
+    """
+    Play one game between two AI players synchronously, without a window or any GUI calls.
+
+    The dice and the players' random choices come from the same streams BackgammonGameManager
+    uses for game game_index of a run seeded with seed, so a seeded game can be replayed.
+
+    :param white: Spec of the White player (see PlayerFactory.create_player)
+    :param black: Spec of the Black player
+    :param seed: Seed of the run; None plays an unseeded game
+    :param game_index: Index of the game in the run, selects its random streams
+    :param board: The starting board state
+    :param turn_time: Time limit in seconds for players that search (MCTS and Min-Max);
+                      None keeps their default (AI_TURN_TIME)
+    :param max_turns: Stop after this many turns without a winner (None plays until the game is over)
+    :return: dict with
+             "winner": WHITE, BLACK, or None when max_turns ran out,
+             "moves": [(color, roll, moves)] for every turn, moves being [] when none could be played,
+             "turn_times": seconds each turn's choose_move took,
+             "history": [(board, color)] after every turn, color being the side that just moved,
+             "board": the final board.
+    """
+    if HUMAN in (white, black):
+        raise ValueError("Human players need the GUI (BackgammonGameManager)")
+    players = {
+        WHITE: create_player(white, WHITE, board, make_rng(seed, game_index, WHITE)),
+        BLACK: create_player(black, BLACK, board, make_rng(seed, game_index, BLACK)),
+    }
+    dice_rng = make_rng(seed, game_index, "dice")
+
+    current = Board(board)
+    color = WHITE
+    moves, turn_times, history = [], [], []
+    while current.cells[WHITE_OFF] < 15 and current.cells[BLACK_OFF] < 15:
+        if max_turns is not None and len(moves) >= max_turns:
+            break
+        player = players[color]
+        roll = roll_dice(dice_rng)
+
+        start = time.perf_counter()
+        if turn_time is not None and isinstance(player, TIMED_PLAYERS):
+            move_sequence = player.choose_move(current.to_list(), list(roll), time=turn_time)
+        else:
+            move_sequence = player.choose_move(current.to_list(), list(roll))
+        turn_times.append(time.perf_counter() - start)
+
+        move_sequence = [tuple(move) for move in move_sequence or []]
+        current = current.apply_moves(move_sequence, color)
+        moves.append((color, roll, move_sequence))
+        history.append((current.to_list(), color))
+        color = BLACK if color == WHITE else WHITE
+
+    winner = None
+    if current.cells[WHITE_OFF] == 15:
+        winner = WHITE
+    elif current.cells[BLACK_OFF] == 15:
+        winner = BLACK
+    return {"winner": winner, "moves": moves, "turn_times": turn_times, "history": history,
+            "board": current.to_list()}
@@ -0,0 +1,53 @@
+import os
+from collections import OrderedDict
+from Constants import MODEL_CACHE_SIZE
+
+
+class ModelRegistry:
+    def __init__(self, loader, max_size=MODEL_CACHE_SIZE):
+        """
+        Process-wide cache of loaded models, keyed by path and device.
+        Each entry remembers the file's modification time, so a checkpoint that
+        is re-saved (e.g. by training) is reloaded on the next lookup.
+        The least recently used entry is evicted once max_size is exceeded.
+
+        :param loader: Callable (model_path, device) -> loaded model.
+        :param max_size: Maximum number of models kept in memory.
+        """
+        self.loader = loader
+        self.max_size = max_size
+        self.models = OrderedDict()  # (path, device) -> (mtime, model)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, model_path, device="cpu"):
+        """
+        Return the model stored at model_path, loading it only if it is not cached
+        or the file changed since it was loaded.
+        """
+        path = os.path.abspath(model_path)
+        mtime = os.path.getmtime(path)
+        key = (path, str(device))
+
+        entry = self.models.get(key)
+        if entry is not None and entry[0] == mtime:
+            self.models.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        model = self.loader(path, device)
+        self.models[key] = (mtime, model)
+        self.models.move_to_end(key)
+        while len(self.models) > self.max_size:
+            self.models.popitem(last=False)
+        return model
+
+    def clear(self):
+        """
+        Drop every cached model.
+        """
+        self.models.clear()
+
+    def __len__(self):
+        return len(self.models)
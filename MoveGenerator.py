@@ -0,0 +1,139 @@
+from Constants import WHITE, BLACK
+from Board import Board, WHITE_BAR, BLACK_BAR, WHITE_OFF, BLACK_OFF
+
+
+def _build_targets(color):
+    targets = []
+    for from_pos in range(28):
+        row = [None]  # index 0 is unused so rows are indexed by the die value
+        for die in range(1, 7):
+            if color == WHITE:
+                target = die - 1 if from_pos == WHITE_BAR else from_pos + die
+                if target >= 24 and from_pos != WHITE_BAR:
+                    target = WHITE_OFF
+            else:
+                target = 24 - die if from_pos == BLACK_BAR else from_pos - die
+                if target < 0:
+                    target = BLACK_OFF
+            row.append(target)
+        targets.append(row)
+    return targets
+
+def _build_rolls():
+    rolls = []
+    for i in range(1, 7):
+        for j in range(i, 7):
+            if i == j:
+                rolls.append(((i, i, i, i), 1 / 36))  # Doubles are played four times
+            else:
+                rolls.append(((i, j), 2 / 36))
+    return rolls
+
+# Target slot for a move: TARGETS[color][from_pos][die] (bar entry and bearing off included)
+TARGETS = {WHITE: _build_targets(WHITE), BLACK: _build_targets(BLACK)}
+
+# The 21 distinct rolls with their probability: doubles 1/36, the rest 2/36
+ROLLS = _build_rolls()
+
+# Index of each of the 21 rolls in ROLLS, keyed by the sorted dice (see BoardTree.roll_key)
+ROLL_INDEX = {roll: index for index, (roll, _) in enumerate(ROLLS)}
+
+
+def generate_moves(board, roll, color):
+    """
+    Generate every distinct position color can reach with roll.
+
+    Each resulting position is produced once, with one representative move sequence.
+    The backgammon rules on dice usage are enforced: as many dice as possible must be
+    played, and if only one die of a non-double roll can be played it must be the
+    larger one whenever that is possible.
+
+    :param board: The current board (list or Board).
+    :param roll: The dice roll, e.g. [3, 5] or [4, 4, 4, 4].
+    :param color: The color to move.
+    :return: A list of (move_sequence, resulting Board) pairs. When nothing can be
+             played the list holds a single ([], board) entry.
+    """
+    if not isinstance(board, Board):
+        board = Board(board)
+
+    # Each terminal entry is (move_sequence, dice_used, resulting board)
+    terminals = []
+    _search(board, tuple(sorted(roll, reverse=True)), [], [], color, terminals, set())
+
+    max_played = max(len(moves) for moves, _, _ in terminals)
+    candidates = [entry for entry in terminals if len(entry[0]) == max_played]
+
+    # Only one die of a non-double can be played: the larger die wins if it can be used
+    if max_played == 1 and len(roll) == 2 and roll[0] != roll[1]:
+        larger = max(roll)
+        if any(dice[0] == larger for _, dice, _ in candidates):
+            candidates = [entry for entry in candidates if entry[1][0] == larger]
+
+    positions = []
+    seen_positions = set()
+    for moves, _, final_board in candidates:
+        if final_board.cells not in seen_positions:
+            seen_positions.add(final_board.cells)
+            positions.append((moves, final_board))
+    return positions
+
+def _search(board, dice, moves, dice_used, color, terminals, visited):
+    # Different move orders often reach the same (position, remaining dice) state;
+    # it only needs to be expanded once.
+    state = (board.cells, dice)
+    if state in visited:
+        return
+    visited.add(state)
+
+    played = False
+    for i, die in enumerate(dice):
+        if die in dice[:i]:
+            continue  # same die value already tried at this level
+        remaining = dice[:i] + dice[i + 1:]
+        for move in single_die_moves(board, die, color):
+            played = True
+            _search(board.apply(move, color), remaining, moves + [move], dice_used + [die], color, terminals, visited)
+
+    if not played:
+        terminals.append((moves, dice_used, board))
+
+def single_die_moves(board, die, color):
+    """
+    Return every legal (from_pos, to_pos) move for color using one die.
+    """
+    white = color == WHITE
+    blocked = board.black_made if white else board.white_made
+    targets = TARGETS[color]
+
+    if board.captured(color):
+        bar = WHITE_BAR if white else BLACK_BAR
+        target = targets[bar][die]
+        if blocked >> target & 1:
+            return []
+        return [(bar, target)]
+
+    moves = []
+    occupied = board.white_mask if white else board.black_mask
+    all_home = board.white_home if white else board.black_home
+    pieces = occupied
+    while pieces:
+        low_bit = pieces & -pieces
+        from_pos = low_bit.bit_length() - 1
+        pieces ^= low_bit
+
+        target = targets[from_pos][die]
+        if target <= 23:
+            if not blocked >> target & 1:
+                moves.append((from_pos, target))
+        elif all_home:
+            # A larger die may bear off only the piece furthest from home
+            if white:
+                exact = from_pos + die == 24
+                furthest = not occupied & (low_bit - 1)
+            else:
+                exact = from_pos == die - 1
+                furthest = not occupied >> (from_pos + 1)
+            if exact or furthest:
+                moves.append((from_pos, target))
+    return moves
@@ -0,0 +1,271 @@
+import math
+import numpy as np
+from Constants import WHITE, BLACK, MCTS_C, MCTS_NODE_CAPACITY
+from Board import Board, WHITE_OFF, BLACK_OFF
+from MoveGenerator import ROLLS
+
+PLAYERS = (WHITE, BLACK)  # player array value -> color
+NO_NODE = -1
+
+
+class NodeStore:
+    def __init__(self, capacity=MCTS_NODE_CAPACITY):
+        """
+        Structure-of-arrays MCTS tree. A node is an index into the arrays below; the
+        arrays double in size when full.
+
+        Two kinds of node share the arrays:
+        - position nodes: player is to roll on board_id; move_id is the move that led here.
+          Their children are one chance node per distinct roll (roll is the index of
+          the roll in ROLLS, -1 on position nodes), allocated together so a roll is
+          found in O(1).
+        - chance nodes: their children are the positions playable with the roll, one
+          block per chance node in prior order (best first for the player moving), of
+          which the first `expanded` have been added to the search.
+
+        Siblings are always allocated as one contiguous block (first_child, child_count),
+        so the children of a node are a slice of every array.
+
+        Boards and move sequences are kept once each in shared pools; boards are stored as
+        rows of an int8 array (keyed by their Zobrist hash) and rebuilt as Board on access.
+
+        :param capacity: Number of nodes allocated up front.
+        """
+        self.capacity = capacity
+        self.visits = np.zeros(capacity, dtype=np.int32)
+        self.value_sum = np.zeros(capacity, dtype=np.float64)  # summed results, White's perspective
+        self.parent = np.full(capacity, NO_NODE, dtype=np.int32)
+        self.first_child = np.full(capacity, NO_NODE, dtype=np.int32)
+        self.child_count = np.zeros(capacity, dtype=np.int32)
+        self.expanded = np.zeros(capacity, dtype=np.int32)
+        self.move_id = np.full(capacity, NO_NODE, dtype=np.int32)
+        self.board_id = np.full(capacity, NO_NODE, dtype=np.int32)
+        self.player = np.zeros(capacity, dtype=np.int8)
+        self.roll = np.full(capacity, NO_NODE, dtype=np.int8)
+        self.prior = np.zeros(capacity, dtype=np.float32)  # preference of the player who moved here
+        self.size = 0
+
+        self.boards = np.zeros((capacity, 28), dtype=np.int8)  # board_id -> the 28 slots
+        self.board_count = 0
+        self.board_ids = {}  # Board.zobrist -> board_id
+        self.moves = []      # move_id -> move sequence
+        self.move_ids = {}   # tuple(move sequence) -> move_id
+
+    def __len__(self):
+        return self.size
+
+    def _arrays(self):
+        return ("visits", "value_sum", "parent", "first_child", "child_count",
+                "expanded", "move_id", "board_id", "player", "roll", "prior")
+
+    def allocate(self, count):
+        """
+        Reserve count consecutive nodes and return the index of the first.
+        """
+        first = self.size
+        if first + count > self.capacity:
+            capacity = self.capacity
+            while first + count > capacity:
+                capacity *= 2
+            for name in self._arrays():
+                old = getattr(self, name)
+                new = np.empty(capacity, dtype=old.dtype)
+                new[:first] = old[:first]
+                setattr(self, name, new)
+            self.capacity = capacity
+        end = first + count
+        self.visits[first:end] = 0
+        self.value_sum[first:end] = 0.0
+        self.parent[first:end] = NO_NODE
+        self.first_child[first:end] = NO_NODE
+        self.child_count[first:end] = 0
+        self.expanded[first:end] = 0
+        self.move_id[first:end] = NO_NODE
+        self.board_id[first:end] = NO_NODE
+        self.player[first:end] = 0
+        self.roll[first:end] = NO_NODE
+        self.prior[first:end] = 0.0
+        self.size = end
+        return first
+
+    def intern_board(self, board):
+        board_id = self.board_ids.get(board.zobrist)
+        if board_id is None:
+            board_id = self.board_ids[board.zobrist] = self.board_count
+            if board_id == len(self.boards):
+                self.boards = np.concatenate((self.boards, np.zeros_like(self.boards)))
+            self.boards[board_id] = board.cells
+            self.board_count += 1
+        return board_id
+
+    def intern_moves(self, moves):
+        key = tuple(moves)
+        move_id = self.move_ids.get(key)
+        if move_id is None:
+            move_id = self.move_ids[key] = len(self.moves)
+            self.moves.append(list(moves))
+        return move_id
+
+    def add_root(self, board, color):
+        """
+        Start the tree with a position node for board where color is to roll.
+        """
+        node = self.allocate(1)
+        self.board_id[node] = self.intern_board(board if isinstance(board, Board) else Board(board))
+        self.player[node] = PLAYERS.index(color)
+        return node
+
+    # ------------------------------------------------------------ queries
+
+    def board(self, node):
+        return Board(self.boards[self.board_id[node]].tolist())
+
+    def color(self, node):
+        return PLAYERS[self.player[node]]
+
+    def last_move(self, node):
+        return self.moves[self.move_id[node]]
+
+    def is_terminal(self, node):
+        cells = self.boards[self.board_id[node]]
+        return cells[WHITE_OFF] == 15 or cells[BLACK_OFF] == 15
+
+    def children(self, node):
+        """
+        Indices of the children of node (a range over its block).
+        """
+        first = self.first_child[node]
+        return range(first, first + self.child_count[node]) if first != NO_NODE else range(0)
+
+    def chance_node(self, node, roll_index):
+        """
+        The chance node of position node for ROLLS[roll_index], allocating the block of
+        chance nodes on first use.
+        """
+        first = self.first_child[node]
+        if first == NO_NODE:
+            first = self.allocate(len(ROLLS))
+            end = first + len(ROLLS)
+            self.parent[first:end] = node
+            self.roll[first:end] = np.arange(len(ROLLS))
+            self.board_id[first:end] = self.board_id[node]
+            self.player[first:end] = self.player[node]
+            self.first_child[node] = first
+            self.child_count[node] = len(ROLLS)
+        return first + roll_index
+
+    def set_moves(self, chance, candidates, priors=None):
+        """
+        Add the (moves, Board) candidates of a chance node as its (not yet expanded) children.
+
+        :param priors: Optional prior of each candidate; the caller passes the candidates
+                       already sorted best first.
+        """
+        first = self.allocate(len(candidates))
+        end = first + len(candidates)
+        self.parent[first:end] = chance
+        self.player[first:end] = 1 - self.player[chance]
+        if priors is not None:
+            self.prior[first:end] = priors
+        for node, (moves, board) in enumerate(candidates, first):
+            self.move_id[node] = self.intern_moves(moves)
+            self.board_id[node] = self.intern_board(board)
+        self.first_child[chance] = first
+        self.child_count[chance] = len(candidates)
+
+    def most_visited_child(self, node):
+        """
+        The child of node with the most visits, or NO_NODE when it has none.
+        """
+        first, count = self.first_child[node], self.child_count[node]
+        if first == NO_NODE or count == 0:
+            return NO_NODE
+        return first + int(np.argmax(self.visits[first:first + count]))
+
+    def best_ucb_child(self, node, c=MCTS_C, direction=1):
+        """
+        The expanded child of node with the highest UCB value; unvisited children come first.
+        The UCB of all children is computed at once on the contiguous child slice, with
+        the log of the parent's visits taken a single time.
+
+        :param direction: 1 when the player choosing maximizes White's value, -1 when minimizing.
+        """
+        first, count = self.first_child[node], self.expanded[node]
+        if first == NO_NODE or count == 0:
+            return NO_NODE
+        visits = self.visits[first:first + count]
+        if not visits.all():
+            return first + int(visits.argmin())  # the first unvisited child
+
+        log_visits = math.log(self.visits[node])
+        ucb = self.value_sum[first:first + count] / visits
+        if direction != 1:
+            ucb *= direction
+        ucb += c * np.sqrt(log_visits / visits)
+        return first + int(ucb.argmax())
+
+    # ------------------------------------------------------------ updates
+
+    def backpropagate(self, node, result):
+        """
+        Add one visit with result (White's perspective) to node and all its ancestors.
+        """
+        while node != NO_NODE:
+            self.visits[node] += 1
+            self.value_sum[node] += result
+            node = self.parent[node]
+
+    def add_virtual_loss(self, node):
+        """
+        Count a pending visit on node and its ancestors as a loss for the player who
+        chose each move, so the next descents avoid this line until the real result
+        arrives (see resolve_virtual_loss).
+        """
+        while node != NO_NODE:
+            self.visits[node] += 1
+            self.value_sum[node] += 1 - self.player[node]  # 0 when White moved here, 1 when Black did
+            node = self.parent[node]
+
+    def resolve_virtual_loss(self, node, result):
+        """
+        Replace the virtual loss added for node by result (White's perspective).
+        """
+        while node != NO_NODE:
+            self.value_sum[node] += result - (1 - self.player[node])
+            node = self.parent[node]
+
+    def extract(self, root):
+        """
+        Copy the subtree under root into a new store (with root at index 0), e.g. to
+        keep last turn's statistics without the rest of the old tree.
+        """
+        store = NodeStore(max(MCTS_NODE_CAPACITY, self.capacity))
+        new_root = store.allocate(1)
+        self._copy_block(store, root, new_root, 1, NO_NODE)
+
+        pending = [(root, new_root)]
+        while pending:
+            old, new = pending.pop()
+            first, count = self.first_child[old], self.child_count[old]
+            if first == NO_NODE:
+                continue
+            new_first = store.allocate(count)
+            store.first_child[new] = new_first
+            store.child_count[new] = count
+            self._copy_block(store, first, new_first, count, new)
+            pending.extend(zip(range(first, first + count), range(new_first, new_first + count)))
+        return store
+
+    def _copy_block(self, store, first, new_first, count, new_parent):
+        old_slice, new_slice = slice(first, first + count), slice(new_first, new_first + count)
+        store.visits[new_slice] = self.visits[old_slice]
+        store.value_sum[new_slice] = self.value_sum[old_slice]
+        store.expanded[new_slice] = self.expanded[old_slice]
+        store.player[new_slice] = self.player[old_slice]
+        store.roll[new_slice] = self.roll[old_slice]
+        store.prior[new_slice] = self.prior[old_slice]
+        store.parent[new_slice] = new_parent
+        for old, new in zip(range(first, first + count), range(new_first, new_first + count)):
+            store.board_id[new] = store.intern_board(self.board(old))
+            if self.move_id[old] != NO_NODE:
+                store.move_id[new] = store.intern_moves(self.moves[self.move_id[old]])
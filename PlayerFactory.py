@@ -0,0 +1,49 @@
+from Players.Heuristic_Player import Heuristic_Player
+from Players.MCTS_Player import MCTS_Player
+from Players.Min_Max_Player import Min_Max_Player
+from Players.Neural_Player import Neural_Player
+from Players.Human_Player import Human_Player
+from Players.Random_Player import Random_Player
+from Constants import *
+
+
+def create_player(player, color, board=START_BOARD, rng=None):
+    """
+    Build a player from its spec, as chosen on the tournament setup screen: a player type
+    (e.g. MCTS_AI), or a list of the type followed by its parameters:
+    [HEUR_AI, ratios], [NEURAL_AI, model_path], [MCTS_AI, ratios, c(, leaf_evaluation)]
+    or [MIN_MAX_AI, ratios, depth].
+
+    :param player: The player spec
+    :param color: 'white' or 'black'
+    :param board: The starting board state
+    :param rng: random.Random for players that make random choices (Random and MCTS)
+    """
+    if player == HUMAN:
+        return Human_Player(color, board=board) # Human player
+    elif player == RAND_AI:
+        return Random_Player(color, board=board, rng=rng)  # Random AI player
+    elif player == HEUR_AI:
+        return Heuristic_Player(color, board=board)
+    elif player == MIN_MAX_AI:
+        return Min_Max_Player(color, board=board)
+    elif player == MCTS_AI:
+        return MCTS_Player(color, board=board, rng=rng)
+    elif player == NEURAL_AI:
+        return Neural_Player(color, board=board)
+    elif isinstance(player, list):
+        if player[0] == HEUR_AI:
+            return Heuristic_Player(color, board=board, ratios=player[1])
+        elif player[0] == NEURAL_AI:
+            return Neural_Player(color, board=board, model_path=player[1])
+        elif player[0] == MCTS_AI:
+            # Optional fourth entry: LEAF_ROLLOUT or LEAF_NEURAL
+            leaf_evaluation = player[3] if len(player) > 3 else MCTS_LEAF_EVALUATION
+            return MCTS_Player(color, board=board, ratios=player[1], c=player[2],
+                               leaf_evaluation=leaf_evaluation, rng=rng)
+        elif player[0] == MIN_MAX_AI:
+            return Min_Max_Player(color, board=board, ratios=player[1], depth=player[2])
+        else:
+            raise ValueError("Invalid player input format")
+    else:
+        raise ValueError("Invalid player input format")
@@ -1,17 +1,21 @@
 from Players.Player import *
 from Constants import *
 import copy
+import random
 
 class AI_Player(Player):
-    def __init__(self, color: str = WHITE, board= START_BOARD):
+    def __init__(self, color: str = WHITE, board= START_BOARD, rng= None):
         """
         AI Player that extends the base Player class with various decision-making
         strategies (heuristic, MCTS, neural, etc.).
 
         :param color: 'white' or 'black'
         :param board: The starting board state
+        :param rng: random.Random used for every random choice of the player
+                    (see RandomStreams.make_rng); None creates an unseeded one
         """
         super().__init__(color, board, is_human= False)
+        self.rng = rng if rng is not None else random.Random()
         
 
     def __str__(self) -> str:
@@ -1,7 +1,6 @@
 from Constants import *
 from Players.AI_Player import *
 from Eval_position import evaluate_position
-import copy
 
 class Heuristic_Player(AI_Player):
     def __init__(self, color: str = WHITE, board= START_BOARD, ratios= EVAL_DISTRIBUTION):
@@ -34,8 +33,8 @@ class Heuristic_Player(AI_Player):
         if current_color is None:
             current_color = self.color
 
-        all_moves = self.generate_all_moves(self.board, roll, current_color=self.color)
-        best_move, best_score = self.choose_heuristic_best_move(all_moves)
+        candidates = self.generate_all_moves_with_boards(self.board, roll, current_color=self.color)
+        best_move, best_score = self.choose_heuristic_best_move(candidates)
 
         if best_move:
             if DEBUG_MODE:
@@ -46,13 +45,15 @@ class Heuristic_Player(AI_Player):
                 print(f"No valid moves available for {self}.")
             return []
         
-    def choose_heuristic_best_move(self, all_moves):
+    def choose_heuristic_best_move(self, candidates):
+        """
+        :param candidates: (move_sequence, resulting board) pairs from generate_all_moves_with_boards
+        """
         best_score = float('-inf') if self.color == WHITE else float('inf')
         best_move = None
         color_param = 1 if self.color == WHITE else -1
 
-        for moves in all_moves:
-            new_board = self.simulate_moves(copy.deepcopy(self.board), moves, current_color=self.color)
+        for moves, new_board in candidates:
             score = evaluate_position(new_board, self.ratios)
             if color_param * score > color_param * best_score:
                 best_score = score
@@ -60,18 +61,17 @@ class Heuristic_Player(AI_Player):
 
         return best_move, best_score
     
-    def choose_heuristic_top_moves(self, all_moves, top_x=1):
+    def choose_heuristic_top_moves(self, candidates, top_x=1):
         """
         Returns the top X moves (along with their scores) based on a heuristic evaluation.
         Sorts moves in descending order for WHITE, ascending for BLACK.
 
-        :param all_moves: All possible move sequences
+        :param candidates: (move_sequence, resulting board) pairs from generate_all_moves_with_boards
         :param top_x: How many moves to return in the sorted list
         :return: A list of tuples [(move_sequence, score), ...] of size up to top_x
         """
         scored_moves = []
-        for move_seq in all_moves:
-            new_board = self.simulate_moves(copy.deepcopy(self.board), move_seq, current_color=self.color)
+        for move_seq, new_board in candidates:
             score = evaluate_position(new_board, self.ratios)
             scored_moves.append((move_seq, score))
 
@@ -1,14 +1,57 @@
 
 import random
 import time
-import copy
 from Constants import *
 from Players.AI_Player import AI_Player
 from Eval_position import evaluate_position
-from BoardTree import *
+from HeuristicNetNumpy import neural_eval_batch
+import math
+from BoardTree import roll_key
+from Board import Board
+from MoveGenerator import ROLL_INDEX
+from NodeStore import NodeStore, NO_NODE
+from Rollout import rollout
+from RandomStreams import roll_dice
+from concurrent.futures import ProcessPoolExecutor
+
+# Worker processes for root-parallel search, one pool per worker count shared by
+# every MCTS_Player in the process and kept alive across turns
+_SEARCH_POOLS = {}
+
+
+def get_search_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Return the shared pool with the given number of worker processes, starting it on first use.
+    """
+    pool = _SEARCH_POOLS.get(workers)
+    if pool is None:
+        pool = _SEARCH_POOLS[workers] = ProcessPoolExecutor(max_workers=workers)
+    return pool
+
+def root_search(color, board, roll, settings, time_lim, seed):
+    """
+    One worker's independent search from the root (runs in a pool process).
+
+    :param settings: Keyword arguments for MCTS_Player (see MCTS_Player.search_settings)
+    :return: ({move: (visits, wins)} for the root children, number of rollouts)
+    """
+    # Each worker gets its own generator: forked workers would otherwise share the parent's state
+    player = MCTS_Player(color, board, workers=1, rng=random.Random(seed), **settings)
+    tree = player.tree = NodeStore()
+    player.root = tree.add_root(board, color)
+    player.UCT_search(player.root, roll, time_lim)
+    chance = tree.chance_node(player.root, ROLL_INDEX[roll_key(roll)])
+    stats = {tuple(tree.last_move(child)): (int(tree.visits[child]), float(tree.value_sum[child]))
+             for child in tree.children(chance)}
+    return stats, player.rollouts
+
 
 class MCTS_Player(AI_Player):
-    def __init__(self, color: str = WHITE, board= START_BOARD, ratios= EVAL_DISTRIBUTION, c= MCTS_C):
+    def __init__(self, color: str = WHITE, board= START_BOARD, ratios= EVAL_DISTRIBUTION, c= MCTS_C,
+                 rollout_policy= MCTS_ROLLOUT_POLICY, rollout_depth= MCTS_ROLLOUT_DEPTH, workers= MCTS_WORKERS,
+                 prior= MCTS_PRIOR, widening_k= MCTS_WIDENING_K, widening_alpha= MCTS_WIDENING_ALPHA,
+                 model_path= PATH, leaf_evaluation= MCTS_LEAF_EVALUATION, batch_size= MCTS_BATCH_SIZE,
+                 batch_timeout= MCTS_BATCH_TIMEOUT, rng= None):
         """
         AI Player that extends the base Player class with various decision-making
         strategies (heuristic, MCTS, neural, etc.).
@@ -16,22 +59,66 @@ class MCTS_Player(AI_Player):
         :param color: 'white' or 'black'
         :param board: The starting board state
         :param ratios: Weights for heuristic evaluation
-        :param model_path: Path to a trained model (if using neural_eval)
+        :param c: Exploration parameter for UCB
+        :param rollout_policy: ROLLOUT_RANDOM, ROLLOUT_GREEDY or ROLLOUT_TOP_K
+        :param rollout_depth: Turns per rollout before the heuristic scores it (None plays to the end)
+        :param workers: Number of processes searching independent trees from the root (1 searches in-process)
+        :param prior: PRIOR_HEURISTIC, PRIOR_NEURAL or None; orders each roll's moves for expansion
+        :param widening_k: Progressive widening: a roll reached n times searches its
+                           ceil(widening_k * n ** widening_alpha) best moves (None searches all)
+        :param widening_alpha: See widening_k
+        :param model_path: Network used by PRIOR_NEURAL and LEAF_NEURAL
+        :param leaf_evaluation: LEAF_ROLLOUT scores new nodes with rollouts, LEAF_NEURAL with the
+                                network: leaves wait in a queue under virtual loss and are
+                                evaluated together once batch_size are queued or the oldest
+                                has waited batch_timeout seconds
+        :param batch_size: See leaf_evaluation
+        :param batch_timeout: See leaf_evaluation
+        :param rng: random.Random for the dice drawn in the tree and in rollouts, and for the
+                    seeds of worker processes
         """
-        super().__init__(color, board)
+        super().__init__(color, board, rng)
         
         if not abs(sum(ratios.values()) - 1.0) < 1e-6:
             self.ratios = EVAL_DISTRIBUTION
         else:
             self.ratios = ratios
         self.c = c
-        
-        # Initialize the board tree with the current board state
-        self.board_tree = BoardTree(copy.deepcopy(self.board), evaluate_position(self.board, self.ratios))
+        self.rollout_policy = rollout_policy
+        self.rollout_depth = rollout_depth
+        self.rollouts = 0
+        self.workers = workers
+        self.prior = prior
+        self.widening_k = widening_k
+        self.widening_alpha = widening_alpha
+        self.model_path = model_path
+        self.leaf_evaluation = leaf_evaluation
+        self.batch_size = batch_size
+        self.batch_timeout = batch_timeout
+        self.pending = []  # Leaves waiting for the network, under virtual loss
+        self.pending_since = 0.0
+        self.network_evaluations = 0
+        self.batches = 0
+        self.last_choice = NO_NODE  # Root child played last turn, searched for the subtree to reuse
+        self.reuse_ratio = 0.0
+
+        # Search tree (see NodeStore); root is the index of the current position
+        self.tree = NodeStore()
+        self.root = self.tree.add_root(self.board, self.color)
 
     def __str__(self) -> str:
         return f"MCTS AI ({self.color})"
 
+    def search_settings(self) -> dict:
+        """
+        The constructor arguments that define the search (sent to worker processes).
+        """
+        return {"ratios": self.ratios, "c": self.c, "rollout_policy": self.rollout_policy,
+                "rollout_depth": self.rollout_depth, "prior": self.prior, "widening_k": self.widening_k,
+                "widening_alpha": self.widening_alpha, "model_path": self.model_path,
+                "leaf_evaluation": self.leaf_evaluation, "batch_size": self.batch_size,
+                "batch_timeout": self.batch_timeout}
+
     def choose_move(self, board:list ,roll: list, current_color=None, time = AI_TURN_TIME) -> list:
         """
         Executes a move using an MCTS-based approach. 
@@ -45,186 +132,231 @@ class MCTS_Player(AI_Player):
         :param time: Time limit for MCTS
         :return: Best move as a list of (from_pos, to_pos)
         """
-        
-        #self.pieces, self.other_pieces = self.convert_board_to_pieces_array(self.board)
         self.board = board
         if current_color is None:
             current_color = self.color
 
-    
-        # Reset the tree in preparation for MCTS
-        self.board_tree.reset_tree(
-            self.board,
-            evaluate_position(self.board, self.ratios),
-            self.color
-        )
-        
-        # Run MCTS to pick a move
+        # Continue from last turn's tree when it contains the current position,
+        # otherwise start a fresh tree
+        self.rollouts = self.network_evaluations = self.batches = 0
+        previous_visits = int(self.tree.visits[self.root])
+        reused = self.find_reusable_root(self.board) if self.workers == 1 else NO_NODE
+        if reused != NO_NODE:
+            self.tree = self.tree.extract(reused)
+            self.root = 0
+            self.reuse_ratio = float(self.tree.visits[self.root] / previous_visits) if previous_visits else 0.0
+        else:
+            self.tree = NodeStore()
+            self.root = self.tree.add_root(self.board, self.color)
+            self.reuse_ratio = 0.0
 
-        # Pick the best move from children of root, e.g., highest evaluation
-        best_child = self.UCT_search(self.board_tree.root, roll, time)  
+        if self.workers > 1:
+            best_child = self.parallel_search(self.root, roll, time)
+        else:
+            best_child = self.UCT_search(self.root, roll, time)
+        self.last_choice = best_child if self.workers == 1 else NO_NODE
+        if DEBUG_MODE:
+            print(f"{self} ran {self.rollouts} rollouts and {self.network_evaluations} network evaluations "
+                  f"in {self.batches} batches, reused {self.reuse_ratio:.1%} of last turn's visits, "
+                  f"{len(self.tree)} nodes")
 
         best_move = None
-        if best_child:
-            best_move = best_child.get_last_move()
+        if best_child != NO_NODE:
+            best_move = self.tree.last_move(best_child)
 
         if best_move:
             if DEBUG_MODE:
-                print(f"{self} executed moves: {best_move} with score: {best_child.wins}")
+                print(f"{self} executed moves: {best_move} with score: {self.tree.value_sum[best_child]}")
             return best_move
         else: 
             if DEBUG_MODE:
                 print(f"No valid moves available for {self}.")
             return []
         
-    def UCT_search(self, node: BoardNode, roll: list, time_lim = AI_TURN_TIME):
+    def find_reusable_root(self, board: list) -> int:
+        """
+        Look for board among the opponent's replies (under any roll) to the move played last turn.
+
+        :return: The matching node with the most visits, or NO_NODE when the tree has no such position
+        """
+        if self.last_choice == NO_NODE:
+            return NO_NODE
+        tree = self.tree
+        best = NO_NODE
+        for chance in tree.children(self.last_choice):
+            for reply in tree.children(chance):
+                if tree.board(reply) == board and (best == NO_NODE or tree.visits[reply] > tree.visits[best]):
+                    best = reply
+        return best
+
+    def UCT_search(self, node: int, roll: list, time_lim = AI_TURN_TIME) -> int:
         """
         Run multiple MCTS iterations until time is up, then pick the best child of the root.
 
         :param node: Root node of the MCTS tree
-        :param roll: Dice roll for the first expansion (optional)
+        :param roll: Dice roll at the root
         :param time_lim: Time limit in seconds
-        :return: The best child node based on UCB
+        :return: The most visited move for roll
         """
 
         end_time = time.time() + time_lim
-        sent_roll = copy.deepcopy(roll)
 
+        # The root always uses the actual roll; deeper levels draw random rolls
         while time.time() < end_time:
-            self.mcts_select(node, sent_roll)
-            sent_roll = None
+            self.mcts_select(node, roll)
+            if self.pending and time.time() - self.pending_since >= self.batch_timeout:
+                self.evaluate_pending()
+        self.evaluate_pending()
 
-        return node.get_best_ucb_child()
+        return self.tree.most_visited_child(self.tree.chance_node(node, ROLL_INDEX[roll_key(roll)]))
 
-    def mcts_select(self, node: BoardNode, roll: list = None)-> BoardNode:
+    def parallel_search(self, node: int, roll: list, time_lim = AI_TURN_TIME) -> int:
         """
-        Descend the tree using UCB until we find a node to expand or we reach a terminal node.
+        Root-parallel MCTS: each worker process grows its own tree from node for time_lim
+        seconds, then the visits and wins of the root children are summed across workers.
+
+        :return: The root child with the most merged visits
+        """
+        tree = self.tree
+        pool = get_search_pool(self.workers)
+        futures = [
+            pool.submit(root_search, tree.color(node), list(tree.board(node)), roll, self.search_settings(),
+                        time_lim, self.rng.getrandbits(64))
+            for _ in range(self.workers)
+        ]
+
+        merged = {}
+        for future in futures:
+            stats, rollouts = future.result()
+            self.rollouts += rollouts
+            for move, (visits, wins) in stats.items():
+                total_visits, total_wins = merged.get(move, (0, 0.0))
+                merged[move] = (total_visits + visits, total_wins + wins)
+
+        chance = tree.chance_node(node, ROLL_INDEX[roll_key(roll)])
+        board, color = tree.board(node), tree.color(node)
+        tree.set_moves(chance, [(list(move), board.apply_moves(move, color)) for move in merged])
+        for child, (visits, wins) in zip(tree.children(chance), merged.values()):
+            tree.visits[child] = visits
+            tree.value_sum[child] = wins
+        tree.expanded[chance] = len(merged)
+        for parent in (chance, node):
+            tree.visits[parent] += sum(visits for visits, _ in merged.values())
+            tree.value_sum[parent] += sum(wins for _, wins in merged.values())
+        return tree.most_visited_child(chance)
+
+    def mcts_select(self, node: int, roll: list = None) -> int:
+        """
+        Descend the tree until a roll that may widen or a terminal node is reached.
+        At every position a roll is drawn (the root uses roll), and UCB picks among the
+        expanded moves of that roll's chance node only.
 
         :param node: Current node
-        :param roll: Dice roll for expansion (may be None)
+        :param roll: Dice roll at node (None draws a random one); deeper levels draw random rolls
         :return: The node we ended on
         """
+        tree = self.tree
         current_node = node
-        
-        while current_node is not None and not current_node.is_terminal():
-            gen_all = True
+
+        while not tree.is_terminal(current_node):
             if roll is None:
-                gen_all = False
                 roll = self.get_random_roll()
 
-            # If the node is not fully expanded, expand it
-            if not current_node.is_fully_expanded(roll):
-                if gen_all:
-                    child_node = self.mcts_expand_all_moves(current_node, roll)
-                else:
-                    child_node = self.mcts_expand(current_node, roll)
-
-                # If expand() returns None, it means no new child could be created
-                # (often due to no legal moves). Stop selection.
-                if child_node is None:
-                    break
-                
-                return child_node
-            
-            # Otherwise, if the node is fully expanded, we pick a child to explore
-            else:
-                next_node = current_node.get_best_ucb_child(self.c, 1 if current_node.player_turn == self.color else -1)
-                
-                # If we can't pick a valid child, stop
-                if next_node is None:
-                    break
-                
-                current_node = next_node
-
-        # Once the loop is done, return whatever node we ended on
+            chance = tree.chance_node(current_node, ROLL_INDEX[roll_key(roll)])
+            if tree.first_child[chance] == NO_NODE:
+                candidates, priors = self.ordered_candidates(tree.board(current_node), roll, tree.color(current_node))
+                tree.set_moves(chance, candidates, priors)
+            if tree.expanded[chance] < min(tree.child_count[chance], self.widening_limit(tree.visits[chance])):
+                return self.mcts_expand(chance)
+
+            direction = 1 if tree.color(current_node) == WHITE else -1
+            current_node = tree.best_ucb_child(chance, self.c, direction)
+            roll = None
+
+        # The game is over on this line: score the final position again
+        self.mcts_backpropagate(current_node, self.mcts_simulate(current_node))
         return current_node
-    
-    def mcts_expand_all_moves(self, node, roll):
+
+    def ordered_candidates(self, board: Board, roll: list, color: str):
         """
-        Expand by generating all possible child states from the current node.
+        Generate the moves for roll once and sort them best first by the prior.
 
-        :param node: Current node
-        :param roll: Dice roll
-        :return: The child node with the best UCB, or node if no expansions
+        :return: (candidates, priors), priors being the preference of color in [0, 1] (or None)
         """
-        if node.is_fully_expanded(roll):
-            return node
-        
-        all_moves = self.generate_all_moves(node.board, roll, current_color=node.player_turn)
-        if not all_moves:
-            return node # No valid moves available
-
-        for move in all_moves:
-            new_board = self.simulate_moves(copy.deepcopy(node.board), move, current_color=node.player_turn)
-            new_node = BoardNode(
-                new_board,
-                0.0,
-                node.path + [move],
-                self.get_next_player(node.player_turn)
-            )
-            node.add_child(new_node)
-            self.mcts_backpropagate(new_node, self.mcts_simulate(new_node))
-
-        # Mark this node as fully expanded now that we added all moves.
-        node.fully_expand_roll(roll)
-
-        return node.get_best_ucb_child(self.c, 1 if node.player_turn == self.color else -1)
-                
-    def mcts_expand(self, node: BoardNode, roll: list, ) -> BoardNode:
-        """
-        If not terminal and there's an unexpanded move, add one child node; otherwise,
-        return node as is.
-        """
-
-        if node.is_fully_expanded(roll):
-            return node
-        
-        all_moves = self.generate_all_moves(node.board, roll, current_color=node.player_turn)
-        if not all_moves:
-            return node # No valid moves available
-        
-        #get the last moves of the children
-        last_moves = [child.get_last_move() for child in node.children]
-
-        for move in all_moves:
-            if move not in last_moves:
-                new_board = self.simulate_moves(copy.deepcopy(node.board), move, current_color=node.player_turn)
-                new_node = BoardNode(
-                    new_board,
-                    0.0,
-                    node.path + [move],
-                    self.get_next_player(node.player_turn)
-                )
-                node.add_child(new_node)
-                self.mcts_backpropagate(new_node, self.mcts_simulate(new_node))
-                return new_node
-                
-        # Mark this node as fully expanded now that we added all moves.
-        node.fully_expand_roll(roll)
-        return node
-
-    def mcts_simulate(self, node: BoardNode) -> float:
-        """
-        Simulate a playout from the node (e.g. random or heuristic-based) until terminal,
-        and return a final value [0..1] indicating result from White’s perspective.
-        """
-        return evaluate_position(node.board, self.ratios)
-
-    def mcts_backpropagate(self, node: BoardNode, result: float):
+        candidates = self.generate_all_moves_with_boards(board, roll, current_color=color)
+        if self.prior is None or len(candidates) == 1:
+            return candidates, None
+        if self.prior == PRIOR_NEURAL:
+            priors = neural_eval_batch([new_board.cells for _, new_board in candidates], color, self.model_path)
+        else:
+            priors = [evaluate_position(new_board.cells, self.ratios) for _, new_board in candidates]
+            if color == BLACK:
+                priors = [1.0 - value for value in priors]
+        order = sorted(range(len(candidates)), key=priors.__getitem__, reverse=True)
+        return [candidates[i] for i in order], [priors[i] for i in order]
+
+    def widening_limit(self, visits: int) -> int:
+        """
+        Number of moves a roll reached visits times may search (progressive widening).
+        """
+        if self.widening_k is None:
+            return 1 << 30
+        return max(1, math.ceil(self.widening_k * visits ** self.widening_alpha))
+
+    def mcts_expand(self, chance: int) -> int:
+        """
+        Add the next move of a chance node (in prior order) to the search and simulate it,
+        or queue it for the network with LEAF_NEURAL.
+        The candidate moves were generated once, when the roll was first reached.
+
+        :return: The child added
+        """
+        tree = self.tree
+        child = tree.first_child[chance] + tree.expanded[chance]
+        tree.expanded[chance] += 1
+        if self.leaf_evaluation == LEAF_NEURAL and not tree.is_terminal(child):
+            tree.add_virtual_loss(child)
+            if not self.pending:
+                self.pending_since = time.time()
+            self.pending.append(child)
+            if len(self.pending) >= self.batch_size:
+                self.evaluate_pending()
+        else:
+            self.mcts_backpropagate(child, self.mcts_simulate(child))
+        return child
+
+    def evaluate_pending(self):
+        """
+        Evaluate every queued leaf with one batched forward pass and replace their
+        virtual losses with the network's values.
+        """
+        if not self.pending:
+            return
+        tree = self.tree
+        boards = tree.boards[tree.board_id[self.pending]]
+        values = neural_eval_batch(boards, WHITE, self.model_path)  # White's perspective, like the tree
+        for leaf, value in zip(self.pending, values):
+            tree.resolve_virtual_loss(leaf, value)
+        self.network_evaluations += len(self.pending)
+        self.batches += 1
+        self.pending = []
+
+    def mcts_simulate(self, node: int) -> float:
+        """
+        Simulate a playout from the node with the rollout policy until the game ends or
+        rollout_depth turns have been played, and return a final value [0..1] indicating
+        the result from White’s perspective.
+        """
+        self.rollouts += 1
+        return rollout(self.tree.board(node), self.tree.color(node), self.rollout_policy, self.rollout_depth,
+                       self.ratios, rng=self.rng)
+
+    def mcts_backpropagate(self, node: int, result: float):
         """
         Traverse back up from node to root, updating visitation counts and accumulated
         values for each ancestor.
         """
-        while node is not None:
-            node.visits += 1
-            node.wins += result
-            node = node.parent
+        self.tree.backpropagate(node, result)
     
     def get_random_roll(self) -> list:
-        i = random.randint(1, 6)
-        j = random.randint(1, 6)
-        if i == j:
-            return [i, i, i, i]
-        else:
-            return [i, j]
-        
\ No newline at end of file
+        return roll_dice(self.rng)
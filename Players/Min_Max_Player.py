@@ -1,10 +1,26 @@
+import time
 from Constants import *
 from Players.AI_Player import AI_Player
 from Eval_position import evaluate_position
 import copy
 from BoardTree import *
+from Board import Board, WHITE_OFF, BLACK_OFF
+from MoveGenerator import ROLLS
+from TranspositionTable import TranspositionTable
+
+# Range of evaluate_position, used as the bounds for chance-node pruning
+VALUE_MIN, VALUE_MAX = 0.0, 1.0
+
+
+class SearchTimeout(Exception):
+    """
+    Raised inside the search when the turn's time budget runs out.
+    """
+
+
 class Min_Max_Player(AI_Player):
-    def __init__(self, color: str = WHITE, board= START_BOARD, ratios= EVAL_DISTRIBUTION, depth= MIN_MAX_DEPTH):
+    def __init__(self, color: str = WHITE, board= START_BOARD, ratios= EVAL_DISTRIBUTION, depth= MIN_MAX_DEPTH,
+                 iterative= MIN_MAX_ITERATIVE):
         """
         AI Player that extends the base Player class with various decision-making
         strategies (heuristic, MCTS, neural, etc.).
@@ -12,7 +28,8 @@ class Min_Max_Player(AI_Player):
         :param color: 'white' or 'black'
         :param board: The starting board state
         :param ratios: Weights for heuristic evaluation
-        :param depth: The depth of the min-max tree
+        :param depth: The depth of the min-max tree (the maximum depth when iterative)
+        :param iterative: Search depth 1, 2, ... up to depth until the turn time runs out
         """
         super().__init__(color, board)
         
@@ -21,27 +38,55 @@ class Min_Max_Player(AI_Player):
         else:
             self.ratios = ratios
         self.depth = depth
+        self.iterative = iterative
+        self.deadline = None
+        self.completed_depth = 0
+        self.best_child = None  # Root child with the best searched value, set by generate_minmax_tree
 
         # Initialize the board tree with the current board state
         self.board_tree = BoardTree(copy.deepcopy(self.board), evaluate_position(self.board, self.ratios))
+        # Values of positions already searched, shared across turns
+        self.transposition_table = TranspositionTable()
+        # Heuristic values of leaf positions, kept apart so a leaf never gets a searched value
+        self.evaluation_cache = TranspositionTable()
+        self.cutoffs = 0
 
     def __str__(self) -> str:
         return f"Min Max AI Player ({self.color})"
 
-    def choose_move(self, board:list ,roll: list, current_color=None) -> list:
+    def choose_move(self, board:list ,roll: list, current_color=None, time = AI_TURN_TIME) -> list:
+        """
+        Search the best move for roll.
+
+        :param time: Time limit in seconds for iterative deepening. The depth 1 search
+                     always completes; deeper iterations stop at the deadline.
+        """
         self.board = board
         if current_color is None:
             current_color = self.color
 
-        self.board_tree.reset_tree(
-            copy.deepcopy(self.board),
-            evaluate_position(self.board, self.ratios),
-            self.color
-        )
-        self.generate_minmax_tree(self.board_tree.root, self.depth, current_roll=roll)
-        current_node = self.board_tree.root
-        best_child = current_node.get_best_evaluation_child()
+        self.transposition_table.reset_stats()
+        self.evaluation_cache.reset_stats()
+        self.cutoffs = 0
+        if self.iterative:
+            self.iterative_deepening(roll, time)
+        else:
+            self.deadline = None
+            self.board_tree.reset_tree(
+                Board(self.board),
+                evaluate_position(self.board, self.ratios),
+                self.color
+            )
+            self.generate_minmax_tree(self.board_tree.root, self.depth, current_roll=roll)
+            self.completed_depth = self.depth
+        if DEBUG_MODE:
+            table = self.transposition_table
+            print(f"{self} searched to depth {self.completed_depth}, transposition table: {table.hits} hits / "
+                  f"{table.hits + table.misses} probes ({table.hit_rate():.1%}), {len(table)} positions stored, "
+                  f"{len(self.evaluation_cache)} leaf evaluations cached, {self.cutoffs} chance-node cutoffs")
+        best_child = self.best_child
 
+        best_move = None
         if best_child:
             best_move = best_child.get_last_move()
 
@@ -55,58 +100,205 @@ class Min_Max_Player(AI_Player):
             return []
 
 
-    def generate_minmax_tree(self, node: BoardNode, depth: int, current_roll=None):
-        if depth == 0:
-            node.evaluation = evaluate_position(node.board, self.ratios)
-            return node.evaluation
-        
-        if current_roll is not None:
-            rolls_to_use = [current_roll]
-        else:
-            rolls_to_use = self.generate_all_possible_rolls()
+    def iterative_deepening(self, roll: list, time_lim = AI_TURN_TIME):
+        """
+        Search depth 1, 2, ... up to self.depth, each iteration searching the previous
+        iteration's best moves first, until time_lim seconds have passed. The tree of
+        the deepest completed iteration is left in self.board_tree.
+        """
+        end_time = time.time() + time_lim
+        self.deadline = None  # The first iteration always completes so there is a move
+        completed_root = None
+        previous_values = None
+
+        for depth in range(1, self.depth + 1):
+            self.board_tree.reset_tree(
+                Board(self.board),
+                evaluate_position(self.board, self.ratios),
+                self.color
+            )
+            try:
+                self.generate_minmax_tree(self.board_tree.root, depth, roll, previous_values)
+            except SearchTimeout:
+                break
+
+            completed_root = self.board_tree.root
+            self.completed_depth = depth
+            previous_values = {tuple(child.get_last_move()): child.evaluation for child in completed_root.children}
+            self.deadline = end_time
+            if time.time() >= end_time:
+                break
+
+        self.deadline = None
+        self.board_tree.update_root(completed_root)
 
+    def generate_minmax_tree(self, node: BoardNode, depth: int, current_roll: list, previous_values=None) -> float:
+        """
+        Run an expectiminimax search from the root, where node.player_turn has rolled current_roll.
+        Only the root's children are kept as BoardNodes, each with its searched value as
+        evaluation (values are from White's perspective: White maximizes, Black minimizes).
+        Below them the search is depth-first over Boards, so only the current line is in memory.
+        Children cut off by alpha-beta keep their static evaluation, and later children may
+        only return a bound equal to the best value, so the move to play is the first child
+        that strictly improved on the earlier ones, kept in self.best_child.
+
+        :param previous_values: Root move -> value from a shallower search, used to order the root moves.
+        """
         next_player_turn = self.get_next_player(node.player_turn)
+        for moves, new_board in self.generate_all_moves_with_boards(node.board, current_roll, current_color=node.player_turn):
+            node.add_child(BoardNode(
+                board= new_board,
+                evaluation= self.static_evaluation(new_board, next_player_turn),
+                path= node.path + [moves],
+                player_turn= next_player_turn
+            ))
+
+        maximizing = node.player_turn == WHITE
+        children = sorted(node.children, key=lambda child: child.evaluation, reverse=maximizing)
+        if previous_values:
+            children.sort(key=lambda child: previous_values.get(tuple(child.get_last_move()), child.evaluation),
+                          reverse=maximizing)
+
+        alpha, beta = VALUE_MIN, VALUE_MAX
+        best = float("-inf") if maximizing else float("inf")
+        best_child = None
+        for child in children:
+            child.evaluation = self.search_rolls(child.board, next_player_turn, depth - 1, alpha, beta)
+            if (child.evaluation > best) if maximizing else (child.evaluation < best):
+                best, best_child = child.evaluation, child
+            if maximizing:
+                alpha = max(alpha, best)
+            else:
+                beta = min(beta, best)
+            if alpha >= beta:
+                break
+        node.evaluation = best
+        self.best_child = best_child
+        return best
+
+    def expand_moves(self, board: Board, player_turn: str, roll, order: bool = True) -> list:
+        """
+        Return the distinct positions player_turn can reach with roll.
+        With order set, they are returned best-first by their static evaluation
+        so that the strongest move is searched first and produces the tightest bounds.
+        Leaf positions are left unordered: evaluating them up front would cost as much
+        as searching them.
+        """
+        boards = [new_board for _, new_board in self.generate_all_moves_with_boards(board, roll, current_color=player_turn)]
+        if order:
+            next_player_turn = self.get_next_player(player_turn)
+            boards.sort(key=lambda new_board: self.static_evaluation(new_board, next_player_turn),
+                        reverse=player_turn == WHITE)
+        return boards
 
-        for roll in rolls_to_use:
-            all_moves = self.generate_all_moves(node.board, roll, current_color=node.player_turn)
-            if not all_moves:
-                new_node = BoardNode(
-                    node.board,
-                    evaluate_position(node.board, self.ratios),
-                    node.path + [],
-                    next_player_turn
-                )
-                node.add_child(new_node)
-                self.generate_minmax_tree(new_node, depth - 1, None)
+    def static_evaluation(self, board: Board, player_turn: str) -> float:
+        """
+        Heuristic value of a position, cached in the evaluation cache. Searched values live
+        in the transposition table, so every leaf of a search is a plain static evaluation
+        whatever deeper searches reached the same position before.
+        """
+        key = board.position_hash(player_turn)
+        value = self.evaluation_cache.probe(key, 0)
+        if value is None:
+            value = evaluate_position(board.cells, self.ratios)
+            self.evaluation_cache.store(key, 0, value)
+        return value
+
+    def search_moves(self, boards: list, player_turn: str, depth: int, alpha: float, beta: float) -> float:
+        """
+        Max (White) or min (Black) node over the positions player_turn can reach with one roll.
+        Standard alpha-beta: stops as soon as the window closes. Returns a fail-soft
+        value, i.e. a bound when it falls outside (alpha, beta).
+        """
+        maximizing = player_turn == WHITE
+        next_player_turn = self.get_next_player(player_turn)
+        best = float("-inf") if maximizing else float("inf")
+        for board in boards:
+            value = self.search_rolls(board, next_player_turn, depth - 1, alpha, beta)
+            if maximizing:
+                best = max(best, value)
+                alpha = max(alpha, best)
             else:
-                for moves in all_moves:
-                    child_board = copy.deepcopy(node.board)
-                    self.simulate_moves(child_board, moves, current_color=node.player_turn)
+                best = min(best, value)
+                beta = min(beta, best)
+            if alpha >= beta:
+                break
+        return best
 
-                    child_node = BoardNode(
-                        board= child_board,
-                        evaluation= 0.0,
-                        path= node.path + [moves],
-                        player_turn= next_player_turn
-                    )
-                    node.add_child(child_node)
+    def search_rolls(self, board: Board, player_turn: str, depth: int, alpha: float, beta: float) -> float:
+        """
+        Chance node: player_turn is about to roll on board. Returns the probability-weighted
+        value over the 21 distinct rolls, or a bound outside (alpha, beta) when the
+        Star1/Star2 bounds prove the exact value cannot fall inside the window.
+        """
+        if depth == 0 or board.cells[WHITE_OFF] == 15 or board.cells[BLACK_OFF] == 15:
+            return self.static_evaluation(board, player_turn)
 
-                    self.generate_minmax_tree(child_node, depth - 1, None)
+        if self.deadline is not None and time.time() > self.deadline:
+            raise SearchTimeout()
 
-        if node.children:
-            total = sum(child.evaluation for child in node.children)
-            node.evaluation = total / len(node.children)
+        key = board.position_hash(player_turn)
+        cached = self.transposition_table.probe(key, depth)
+        if cached is not None:
+            return cached
+
+        next_player_turn = self.get_next_player(player_turn)
+        maximizing = player_turn == WHITE
+        if depth > 1:
+            expansions = [self.expand_moves(board, player_turn, roll) for roll, _ in ROLLS]
+
+            # Star2 probing: the value of one (best ordered) move per roll bounds that roll's
+            # max/min node from one side. If the combined bound already lies outside the
+            # window the whole chance node is cut off.
+            lower, upper = [], []
+            for boards in expansions:
+                probe = self.search_rolls(boards[0], next_player_turn, depth - 1, VALUE_MIN, VALUE_MAX)
+                lower.append(probe if maximizing else VALUE_MIN)
+                upper.append(VALUE_MAX if maximizing else probe)
+        else:
+            # Just above the leaves probing costs as much as searching: use plain Star1
+            # bounds and generate each roll's moves only when it is reached.
+            expansions = [None] * len(ROLLS)
+            lower = [VALUE_MIN] * len(ROLLS)
+            upper = [VALUE_MAX] * len(ROLLS)
+
+        rest_lower = sum(probability * bound for (_, probability), bound in zip(ROLLS, lower))
+        rest_upper = sum(probability * bound for (_, probability), bound in zip(ROLLS, upper))
+        if rest_lower >= beta or rest_upper <= alpha:
+            self.cutoffs += 1
+            return rest_lower if rest_lower >= beta else rest_upper
+
+        # Star1 search: each roll gets the window that would still let the weighted
+        # sum land inside (alpha, beta), given the bounds on the rolls not yet searched.
+        done = 0.0
+        for i, (roll, probability) in enumerate(ROLLS):
+            rest_lower -= probability * lower[i]
+            rest_upper -= probability * upper[i]
+            roll_alpha = (alpha - done - rest_upper) / probability
+            roll_beta = (beta - done - rest_lower) / probability
+
+            if roll_alpha >= upper[i]:
+                value = upper[i]
+            elif roll_beta <= lower[i]:
+                value = lower[i]
+            else:
+                boards = expansions[i] or self.expand_moves(board, player_turn, roll, order=False)
+                value = self.search_moves(boards, player_turn, depth,
+                                          max(roll_alpha, lower[i]), min(roll_beta, upper[i]))
+
+            if value <= roll_alpha:
+                self.cutoffs += 1
+                return done + probability * value + rest_upper
+            if value >= roll_beta:
+                self.cutoffs += 1
+                return done + probability * value + rest_lower
+            done += probability * value
+
+        self.transposition_table.store(key, depth, done)
+        return done
 
     def generate_all_possible_rolls(self) -> list:
         """
-        Generate all unique dice roll combinations.
-        :return: A list of unique dice roll combinations.
-        """
-        rolls = set()
-        for i in range(1, 7):
-            for j in range(i, 7):
-                if i == j:
-                    rolls.add((i, i, i, i))  # Doubles are played four times
-                else:
-                    rolls.add((i, j))
-        return list(rolls)
\ No newline at end of file
+        Return the 21 distinct dice roll combinations (doubles are played four times).
+        """
+        return [roll for roll, _ in ROLLS]
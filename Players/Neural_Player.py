@@ -1,8 +1,7 @@
 import os
 from Constants import *
 from Players.AI_Player import AI_Player
-from HeuristicNet import neural_eval
-import copy
+from HeuristicNetNumpy import neural_eval_batch
 
 class Neural_Player(AI_Player):
     def __init__(self, color: str = WHITE, board= START_BOARD, model_path=PATH):
@@ -33,8 +32,8 @@ class Neural_Player(AI_Player):
         if current_color is None:
             current_color = self.color
 
-        all_moves = self.generate_all_moves(self.board, roll, current_color=self.color)
-        best_move, best_score = self.choose_neural_best_move(all_moves)
+        candidates = self.generate_all_moves_with_boards(self.board, roll, current_color=self.color)
+        best_move, best_score = self.choose_neural_best_move(candidates)
 
         if best_move:
             if DEBUG_MODE:
@@ -45,16 +44,19 @@ class Neural_Player(AI_Player):
                 print(f"No valid moves available for {self}.")
             return []
         
-    def choose_neural_best_move(self, all_moves):
+    def choose_neural_best_move(self, candidates):
+        """
+        :param candidates: (move_sequence, resulting board) pairs from generate_all_moves_with_boards
+        """
         best_score = float('-inf')
         best_move = None
 
-        for moves in all_moves:
-            new_board = self.simulate_moves(copy.deepcopy(self.board), moves, current_color=self.color)
-            score = neural_eval(new_board, self.color , self.model_path)
-            if score == 1.0: #best possible score
-                return moves, score
+        # Score every candidate board in one batched forward pass
+        boards = [new_board.cells for _, new_board in candidates]
+        scores = neural_eval_batch(boards, self.color, self.model_path)
+
+        for (moves, _), score in zip(candidates, scores):
             if score > best_score:
                 best_score = score
                 best_move = moves
-        return best_move, best_score
\ No newline at end of file
+        return best_move, best_score
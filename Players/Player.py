@@ -1,5 +1,5 @@
 from Constants import *
-import copy
+from MoveGenerator import generate_moves, TARGETS
 
 class Player:
     def __init__(self, 
@@ -137,8 +137,7 @@ class Player:
         
                 
         if from_pos == get_captured_position(current_color):
-            expected_to_pos = roll_value - 1 if current_color == WHITE else 24 - roll_value
-            if expected_to_pos != to_pos:
+            if TARGETS[current_color][from_pos][roll_value] != to_pos:
                 if DEBUG_MODE and not simulate:
                     print(f"No matching die value for this move from the bar to {to_pos}")
                     raise ValueError(f"No matching die value for this move from the bar to {to_pos}")
@@ -169,8 +168,7 @@ class Player:
                 return False
             
         else:
-            move_distance = to_pos - from_pos if current_color == WHITE else from_pos - to_pos
-            if move_distance != roll_value:
+            if TARGETS[current_color][from_pos][roll_value] != to_pos:
                 if DEBUG_MODE and not simulate:
                     print(f"Cannot move piece from {from_pos} to {to_pos}")
                     raise ValueError(f"Cannot move piece from {from_pos} to {to_pos}")
@@ -325,20 +323,7 @@ class Player:
     def calculate_target_position(self, from_pos, distance, color = None):
         if color is None:
             color = self.color
-
-        if color == WHITE:
-            target = from_pos + distance
-            if target >= 24:
-                target = get_escaped_position(color)
-            if from_pos == get_captured_position(color):
-                target = distance - 1
-        else:
-            target = from_pos - distance
-            if target < 0:
-                target = get_escaped_position(color)
-            if from_pos == get_captured_position(color):
-                target = 24 - distance
-        return target
+        return TARGETS[color][from_pos][distance]
 
     def calculate_target_distance(self, from_pos, to_pos, color = None):
         if color is None:
@@ -363,48 +348,19 @@ class Player:
         return distance
 
     def generate_all_moves(self, board: list, roll: list, current_color=None) -> list:
+        """
+        Return one move sequence per distinct position reachable with roll.
+        """
+        return [moves for moves, _ in self.generate_all_moves_with_boards(board, roll, current_color)]
+
+    def generate_all_moves_with_boards(self, board: list, roll: list, current_color=None) -> list:
+        """
+        Return (move_sequence, resulting Board) pairs, one per distinct reachable position,
+        so callers can score the result without simulating the moves again.
+        """
         if current_color is None:
             current_color = self.color
-        all_moves = []
-        self.generate_moves_recursive(board, roll, [], all_moves, current_color)
-        return all_moves
-
-    def generate_moves_recursive(self, board: list, rolls: list, move_sequence: list, all_moves: list, current_color: str):
-        if not rolls:
-            all_moves.append(move_sequence)
-            return
-
-        captured_pos = get_captured_position(current_color)
-        pieces_on_bar = board[captured_pos]
-        possible_moves_found = False
-
-        sorted_rolls = sorted(rolls, reverse=True)
-        unique_rolls = set(sorted_rolls)
-
-        for roll_val in unique_rolls:
-            remaining_rolls = sorted_rolls.copy()
-            remaining_rolls.remove(roll_val)
-            possible_moves = self.generate_valid_moves([roll_val], board, current_color)
-
-            if pieces_on_bar > 0:
-                possible_moves = [m for m in possible_moves if m[0] == captured_pos]
-
-            if not possible_moves:
-                continue
-
-            possible_moves_found = True
-            for move in possible_moves:
-                new_board = self.simulate_move(copy.deepcopy(board), move, current_color)
-                self.generate_moves_recursive(
-                    new_board,
-                    remaining_rolls,
-                    move_sequence + [move],
-                    all_moves,
-                    current_color
-                )
-
-        if not possible_moves_found:
-            all_moves.append(move_sequence)
+        return generate_moves(board, roll, current_color)
 
     def generate_valid_moves(self, roll_values: list, board: list, current_color: str) -> list:
         if self.has_captured_piece(board, current_color):
@@ -1,8 +1,7 @@
-import random
 from Constants import *
 from Players.AI_Player import AI_Player
 class Random_Player(AI_Player):
-    def __init__(self, color: str = WHITE, board= START_BOARD):
+    def __init__(self, color: str = WHITE, board= START_BOARD, rng= None):
         """
         AI Player that extends the base Player class with various decision-making
         strategies (heuristic, MCTS, neural, etc.).
@@ -11,8 +10,9 @@ class Random_Player(AI_Player):
         :param board: The starting board state
         :param ratios: Weights for heuristic evaluation
         :param model_path: Path to a trained model (if using neural_eval)
+        :param rng: random.Random the moves are drawn from
         """
-        super().__init__(color, board)
+        super().__init__(color, board, rng)
         
 
     def __str__(self) -> str:
@@ -30,7 +30,7 @@ class Random_Player(AI_Player):
             current_color = self.color
 
         all_moves = self.generate_all_moves(self.board, roll, current_color=self.color)
-        rnd_indx = random.randint(0, len(all_moves) - 1) if all_moves else 0
+        rnd_indx = self.rng.randint(0, len(all_moves) - 1) if all_moves else 0
         if all_moves:
             if DEBUG_MODE:
                 print(f"{self} executed moves: {all_moves[rnd_indx]}.")
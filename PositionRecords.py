@@ -0,0 +1,76 @@
+import os
+import numpy as np
+from Constants import BOARD_SIZE
+
+# One training position, 39 bytes, little-endian and unpadded
+RECORD_DTYPE = np.dtype([
+    ("board", np.int8, (BOARD_SIZE,)),  # The 28 board slots
+    ("side", np.int8),                  # 1 when White just moved, -1 for Black
+    ("target", "<f4"),                  # Training target for that side, in [0, 1]
+    ("game_id", "<u4"),                 # Game the position comes from
+    ("ply", "<u2"),                     # Turn number within the game, from 0
+])
+
+# A record file is a fixed header followed by the records back to back
+MAGIC = b"BGRC"
+VERSION = 1
+HEADER_DTYPE = np.dtype([("magic", "S4"), ("version", "<u2"), ("record_size", "<u2")])
+HEADER_SIZE = HEADER_DTYPE.itemsize
+RECORD_SUFFIX = ".bgr"
+
+
+def make_records(boards, sides, targets, game_id, plies=None) -> np.ndarray:
+    """
+    Pack the positions of one game into records.
+
+    :param boards: (N, 28) board slots
+    :param sides: (N,) 1 / -1 for the side each position belongs to
+    :param targets: (N,) training targets
+    :param game_id: Id shared by all the positions
+    :param plies: (N,) turn numbers (default 0, 1, ..., N - 1)
+    """
+    records = np.zeros(len(boards), dtype=RECORD_DTYPE)
+    records["board"] = boards
+    records["side"] = sides
+    records["target"] = targets
+    records["game_id"] = game_id
+    records["ply"] = np.arange(len(boards)) if plies is None else plies
+    return records
+
+def write_records(path, records):
+    """
+    Write records to path. The file is written under a temporary name and renamed when
+    complete, so a reader never sees a partial file.
+    """
+    header = np.array([(MAGIC, VERSION, RECORD_DTYPE.itemsize)], dtype=HEADER_DTYPE)
+    with open(path + ".tmp", "wb") as f:
+        f.write(header.tobytes())
+        f.write(np.ascontiguousarray(records, dtype=RECORD_DTYPE).tobytes())
+    os.replace(path + ".tmp", path)
+
+def read_records(path) -> np.ndarray:
+    """
+    Map a record file into memory without reading or parsing it. The result is a read-only
+    structured array: records["board"] is an (N, 28) int8 view, records["target"] an (N,)
+    float view, and so on; the pages are loaded on access and shared between processes
+    mapping the same file.
+
+    :raises ValueError: If the file is not a record file of this version.
+    """
+    header = np.fromfile(path, dtype=HEADER_DTYPE, count=1)
+    if len(header) != 1 or header["magic"][0] != MAGIC or header["version"][0] != VERSION \
+            or header["record_size"][0] != RECORD_DTYPE.itemsize:
+        raise ValueError(f"{path} is not a version {VERSION} position record file")
+    count = (os.path.getsize(path) - HEADER_SIZE) // RECORD_DTYPE.itemsize
+    if count == 0:
+        return np.zeros(0, dtype=RECORD_DTYPE)  # an empty file cannot be mapped
+    return np.memmap(path, dtype=RECORD_DTYPE, mode="r", offset=HEADER_SIZE, shape=(count,))
+
+def network_inputs(records) -> np.ndarray:
+    """
+    The network input of each record: its board slots followed by its side, as float32 (N, 29).
+    """
+    inputs = np.empty((len(records), BOARD_SIZE + 1), dtype=np.float32)
+    inputs[:, :BOARD_SIZE] = records["board"]
+    inputs[:, BOARD_SIZE] = records["side"]
+    return inputs
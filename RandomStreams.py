@@ -0,0 +1,29 @@
+import random
+from Constants import GAME_SEED
+
+
+def make_rng(seed=GAME_SEED, *stream) -> random.Random:
+    """
+    Return an independent random generator for one stream of a run.
+
+    The generator is seeded from the run seed together with the stream id, e.g.
+    make_rng(seed, game_index, "dice"), so every game, player and worker gets its own
+    reproducible sequence and no two streams of a run collide.
+
+    :param seed: Seed of the whole run; None seeds from the operating system (not reproducible).
+    :param stream: Any number of ints or strings identifying the stream within the run.
+    """
+    if seed is None:
+        return random.Random()
+    return random.Random(":".join(str(part) for part in (seed,) + stream))
+
+def roll_dice(rng=random) -> list:
+    """
+    Roll two dice; doubles are played four times.
+
+    :param rng: Source of randomness (a random.Random, or the random module itself).
+    """
+    i, j = rng.randint(1, 6), rng.randint(1, 6)
+    if i == j:
+        return [i, i, i, i]
+    return [i, j]
@@ -0,0 +1,203 @@
+import json
+import math
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from Constants import *
+from Tournament import play_pairing
+
+Q = math.log(10) / 400  # Glicko scale factor
+
+
+def player_key(spec) -> str:
+    """
+    Stable text id of a player spec, used to find a bot in the rating table.
+    """
+    return json.dumps(spec, sort_keys=True)
+
+def glicko_g(rd):
+    """
+    Glicko's weight of a game against an opponent with deviation rd (1 for a known opponent).
+    Works on floats and NumPy arrays.
+    """
+    return 1 / np.sqrt(1 + 3 * Q ** 2 * np.square(rd) / math.pi ** 2)
+
+def expected_score(rating, opponent_rating, opponent_rd):
+    """
+    Expected score of a player against an opponent, discounted by the opponent's uncertainty.
+    Works on floats and NumPy arrays.
+    """
+    return 1 / (1 + 10 ** (-glicko_g(opponent_rd) * (rating - opponent_rating) / 400))
+
+
+class RatingTable:
+    def __init__(self):
+        """
+        Glicko-1 ratings of a pool of bot configurations.
+
+        Each bot has a rating and a rating deviation (RD): its strength is rating ± 1.96 RD
+        with 95% confidence. Results are applied a round at a time (a Glicko rating period):
+        every rating of the round is updated from the ratings before it.
+        Instead of a full round-robin, each round pairs the bots whose games tell the most
+        (see pairings), so a large pool can be screened in a few games per bot.
+        """
+        self.specs = []      # bot index -> player spec
+        self.index = {}      # player_key(spec) -> bot index
+        self.ratings = []
+        self.rds = []
+        self.games = []
+        self.wins = []
+        self.games_played = 0  # Games played by the table so far, also the next game's seed index
+
+    def __len__(self):
+        return len(self.specs)
+
+    def add(self, spec) -> int:
+        """
+        Add a bot (if it is not in the table yet) and return its index.
+        """
+        key = player_key(spec)
+        if key not in self.index:
+            self.index[key] = len(self.specs)
+            self.specs.append(spec)
+            self.ratings.append(RATING_INITIAL)
+            self.rds.append(RATING_INITIAL_RD)
+            self.games.append(0)
+            self.wins.append(0)
+        return self.index[key]
+
+    def interval(self, i: int, z: float = 1.96) -> tuple:
+        """
+        Confidence interval (low, high) of bot i's rating.
+        """
+        return self.ratings[i] - z * self.rds[i], self.ratings[i] + z * self.rds[i]
+
+    def leaderboard(self) -> list:
+        """
+        Bot indices, best first by the low end of their 95% interval, so bots that only
+        look strong because they played few games do not come first.
+        """
+        return sorted(range(len(self)), key=lambda i: self.interval(i)[0], reverse=True)
+
+    # ------------------------------------------------------------ pairing
+
+    def pairings(self, count: int = None) -> list:
+        """
+        Choose up to count disjoint pairs (i, j) for the next round, most informative first.
+
+        The bots are taken by decreasing deviation, each paired with the still unpaired
+        opponent whose result would tell the most about it: Glicko's information
+        g(RD_j)^2 E (1 - E) is highest against a well-known opponent of similar rating.
+
+        :param count: Number of pairs (None pairs as many bots as possible)
+        """
+        if count is None:
+            count = len(self) // 2
+        ratings, rds = np.array(self.ratings), np.array(self.rds)
+        available = np.ones(len(self), dtype=bool)
+        pairs = []
+        for i in np.argsort(-rds, kind="stable"):
+            if len(pairs) >= count:
+                break
+            if not available[i]:
+                continue
+            available[i] = False
+            if not available.any():
+                break
+            expected = expected_score(ratings[i], ratings, rds)
+            information = np.where(available, glicko_g(rds) ** 2 * expected * (1 - expected), -1.0)
+            j = int(information.argmax())
+            available[j] = False
+            pairs.append((int(i), j))
+        return pairs
+
+    # ------------------------------------------------------------ updates
+
+    def update(self, results: list):
+        """
+        Apply one rating period.
+
+        :param results: (i, j, score of i) for every game of the round, the score being
+                        1 for a win, 0 for a loss and 0.5 for an unfinished game
+        """
+        games = {}
+        for i, j, score in results:
+            games.setdefault(i, []).append((j, score))
+            games.setdefault(j, []).append((i, 1 - score))
+
+        ratings, rds = list(self.ratings), list(self.rds)  # ratings before the period
+        for i in range(len(self)):
+            rd = min(math.sqrt(rds[i] ** 2 + RATING_RD_GROWTH ** 2), RATING_INITIAL_RD)
+            if i not in games:
+                self.rds[i] = rd
+                continue
+            opponents = np.array([j for j, _ in games[i]])
+            scores = np.array([score for _, score in games[i]])
+            g = glicko_g(np.array(rds)[opponents])
+            expected = expected_score(ratings[i], np.array(ratings)[opponents], np.array(rds)[opponents])
+            d2 = 1 / (Q ** 2 * np.sum(g ** 2 * expected * (1 - expected)))
+            precision = 1 / rd ** 2 + 1 / d2
+            self.ratings[i] = ratings[i] + Q / precision * float(np.sum(g * (scores - expected)))
+            self.rds[i] = max(math.sqrt(1 / precision), RATING_MIN_RD)
+            self.games[i] += len(scores)
+            self.wins[i] += int(np.sum(scores == 1))
+
+    def play_round(self, count: int = None, seed=GAME_SEED, workers=TOURNAMENT_WORKERS, turn_time=None,
+                   pool=None) -> list:
+        """
+        Pair the bots (see pairings), play the games headless in worker processes and
+        apply the results as one rating period.
+
+        :param pool: An executor to reuse across rounds (a new one is started otherwise)
+        :return: The (i, j, score of i) results of the round
+        """
+        pairs = self.pairings(count)
+        own_pool = pool is None
+        if own_pool:
+            pool = ProcessPoolExecutor(max_workers=workers)
+        try:
+            futures = []
+            for i, j in pairs:
+                game_index = self.games_played
+                self.games_played += 1
+                black, white = (i, j) if game_index % 2 == 0 else (j, i)
+                futures.append(pool.submit(play_pairing, self.specs, black, white, seed, game_index, turn_time))
+            results = []
+            for (i, j), future in zip(pairs, futures):
+                winner = future.result()["winner"]
+                results.append((i, j, 0.5 if winner is None else float(winner == i)))
+        finally:
+            if own_pool:
+                pool.shutdown()
+        self.update(results)
+        return results
+
+    # ------------------------------------------------------------ persistence
+
+    def save(self, path=RATINGS_FILE):
+        data = {
+            "games_played": self.games_played,
+            "players": [
+                {"spec": spec, "rating": rating, "rd": rd, "games": games, "wins": wins}
+                for spec, rating, rd, games, wins in zip(self.specs, self.ratings, self.rds, self.games, self.wins)
+            ],
+        }
+        with open(path, "w") as f:
+            json.dump(data, f, indent=1)
+
+    @classmethod
+    def load(cls, path=RATINGS_FILE) -> "RatingTable":
+        """
+        Read a table written by save; a missing file gives an empty table.
+        """
+        table = cls()
+        if not os.path.exists(path):
+            return table
+        with open(path) as f:
+            data = json.load(f)
+        table.games_played = data["games_played"]
+        for player in data["players"]:
+            i = table.add(player["spec"])
+            table.ratings[i], table.rds[i] = player["rating"], player["rd"]
+            table.games[i], table.wins[i] = player["games"], player["wins"]
+        return table
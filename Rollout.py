@@ -0,0 +1,107 @@
+import random
+from Constants import (WHITE, BLACK, EVAL_DISTRIBUTION, ROLLOUT_RANDOM, ROLLOUT_GREEDY, ROLLOUT_TOP_K,
+                       MCTS_ROLLOUT_POLICY, MCTS_ROLLOUT_DEPTH, MCTS_ROLLOUT_TOP_K)
+from Board import Board, WHITE_BAR, BLACK_BAR, WHITE_OFF, BLACK_OFF
+from MoveGenerator import single_die_moves
+from Eval_position import evaluate_position
+
+ROLLOUT_POLICIES = (ROLLOUT_RANDOM, ROLLOUT_GREEDY, ROLLOUT_TOP_K)
+
+# Pips a piece on each slot still has to travel, per color (bar 25, borne off 0)
+PIP_DISTANCE = {
+    WHITE: [24 - point for point in range(24)] + [25, 0, 0, 0],
+    BLACK: [point + 1 for point in range(24)] + [0, 25, 0, 0],
+}
+# greedy_score contribution of a point holding count of a color's pieces (made point / blot)
+POINT_SCORE = [0, -3] + [4] * 15
+
+
+def rollout(board, color, policy=MCTS_ROLLOUT_POLICY, max_plies=MCTS_ROLLOUT_DEPTH, ratios=EVAL_DISTRIBUTION,
+            top_k=MCTS_ROLLOUT_TOP_K, rng=random):
+    """
+    Play a game out from board with random dice and fast policy moves.
+
+    :param board: The starting position (list or Board).
+    :param color: The color to roll first.
+    :param policy: ROLLOUT_RANDOM, ROLLOUT_GREEDY or ROLLOUT_TOP_K.
+    :param max_plies: Stop after this many turns and score the position with
+                      evaluate_position; None plays until the game is over.
+    :param ratios: Weights for evaluate_position at the cutoff.
+    :param top_k: Number of best greedy moves ROLLOUT_TOP_K picks from at random.
+    :param rng: Source of randomness (anything with randint and random methods).
+    :return: The result from White's perspective: 1.0 / 0.0 for a finished game,
+             otherwise the heuristic value of the position reached.
+    """
+    if policy not in ROLLOUT_POLICIES:
+        raise ValueError(f"Unknown rollout policy: {policy}")
+    if not isinstance(board, Board):
+        board = Board(board)
+
+    plies = 0
+    while board.cells[WHITE_OFF] < 15 and board.cells[BLACK_OFF] < 15:
+        if max_plies is not None and plies >= max_plies:
+            return evaluate_position(board.cells, ratios)
+        i, j = rng.randint(1, 6), rng.randint(1, 6)
+        dice = (i, i, i, i) if i == j else (max(i, j), min(i, j))
+        board = play_turn(board, dice, color, policy, top_k, rng)
+        color = BLACK if color == WHITE else WHITE
+        plies += 1
+    return 1.0 if board.cells[WHITE_OFF] == 15 else 0.0
+
+def play_turn(board, dice, color, policy=MCTS_ROLLOUT_POLICY, top_k=MCTS_ROLLOUT_TOP_K, rng=random):
+    """
+    Play one turn a die at a time, larger die first, skipping dice that cannot be used.
+    This is much cheaper than generating every full move sequence, at the cost of not
+    enforcing the rule that as many dice as possible must be played.
+    """
+    for die in dice:
+        moves = single_die_moves(board, die, color)
+        if not moves:
+            continue
+        if policy == ROLLOUT_RANDOM:
+            board = board.apply(moves[rng.randint(0, len(moves) - 1)], color)
+            continue
+
+        # Rank the moves by their score change and only build the board of the one played
+        cells = board.cells
+        if policy == ROLLOUT_GREEDY or len(moves) == 1:
+            move = max(moves, key=lambda move: greedy_gain(cells, move, color))
+        else:
+            moves.sort(key=lambda move: greedy_gain(cells, move, color), reverse=True)
+            move = moves[rng.randint(0, min(top_k, len(moves)) - 1)]
+        board = board.apply(move, color)
+    return board
+
+def greedy_score(board, color):
+    """
+    Cheap score of a position for color, read from the Board caches: race lead
+    (hits count through the opponent's pip count), made points and exposed blots.
+    """
+    if color == WHITE:
+        race = board.black_pips - board.white_pips
+        made, blots = board.white_made, board.white_blots
+    else:
+        race = board.white_pips - board.black_pips
+        made, blots = board.black_made, board.black_blots
+    return race + 4 * bin(made).count("1") - 3 * bin(blots).count("1")
+
+def greedy_gain(cells, move, color):
+    """
+    Change of greedy_score when color plays the single move, computed from the 28 slots
+    without building the resulting Board: the pips moved, the pips a hit sends back,
+    and the made points and blots changed on the source and destination points.
+    """
+    from_pos, to_pos = move
+    distance = PIP_DISTANCE[color]
+    sign = 1 if color == WHITE else -1
+    gain = distance[from_pos] - distance[to_pos]
+    if from_pos != WHITE_BAR and from_pos != BLACK_BAR:
+        count = cells[from_pos] * sign
+        gain += POINT_SCORE[count - 1] - POINT_SCORE[count]
+    if to_pos != WHITE_OFF and to_pos != BLACK_OFF:
+        count = cells[to_pos] * sign
+        if count < 0:  # hit: the blot goes back to the bar
+            gain += distance[to_pos]
+            count = 0
+        gain += POINT_SCORE[count + 1] - POINT_SCORE[count]
+    return gain
@@ -0,0 +1,144 @@
+import glob
+import os
+import shutil
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from Constants import *
+from Eval_position import win_based_evaluation
+from MatchRunner import play_match
+from PositionRecords import RECORD_DTYPE, RECORD_SUFFIX, make_records, write_records, read_records
+
+CONSUMED_DIR = "consumed"  # Subdirectory shards are moved to once trained on
+
+
+def game_records(history, winner, game_id=0):
+    """
+    Training records of one finished game, labeled like HeuristicNet.generate_data_from_boards:
+    every position is scored for the side that just moved, with the winner's positions
+    getting win_based_evaluation of the final board and the loser's positions the rest.
+
+    :param history: [(board, color)] after every turn (see MatchRunner.play_match)
+    :param winner: WHITE or BLACK
+    :param game_id: Id stored with every record of the game
+    :return: The records (see PositionRecords.RECORD_DTYPE), side 1 for White / -1 for Black
+    """
+    value = win_based_evaluation(history[-1][0], winner)
+    boards = [board for board, _ in history]
+    sides = [1 if color == WHITE else -1 for _, color in history]
+    targets = [value if color == winner else 1 - value for _, color in history]
+    return make_records(boards, sides, targets, game_id)
+
+
+class ShardWriter:
+    def __init__(self, directory=SELF_PLAY_DIR, name="selfplay", records_per_shard=SHARD_RECORDS):
+        """
+        Collect training records and write them out in shards of records_per_shard
+        (PositionRecords files). A shard is written under a temporary name and renamed
+        when complete, so a trainer reading the directory never sees a partial file.
+
+        :param directory: Where the shards go (created if needed)
+        :param name: File name prefix, unique per writer (e.g. run and worker)
+        """
+        self.directory = directory
+        self.name = name
+        self.records_per_shard = records_per_shard
+        self.shards = []  # Paths of the shards written
+        self.records = 0
+        self._parts = []
+        self._buffered = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def add(self, records):
+        self._parts.append(records)
+        self._buffered += len(records)
+        self.records += len(records)
+        if self._buffered >= self.records_per_shard:
+            self.flush()
+
+    def flush(self):
+        """
+        Write the buffered records as one shard (nothing when the buffer is empty).
+        """
+        if not self._parts:
+            return
+        path = os.path.join(self.directory, f"{self.name}-{len(self.shards):05d}{RECORD_SUFFIX}")
+        write_records(path, np.concatenate(self._parts))
+        self.shards.append(path)
+        self._parts, self._buffered = [], 0
+
+    def close(self):
+        self.flush()
+
+
+def self_play_worker(worker, start, games, directory, name, white, black, seed, turn_time, records_per_shard):
+    """
+    Play games headless and stream their records to shards (runs in a pool process).
+    Game k of the worker uses the random streams of game index start + k, which is
+    also its game id in the records.
+
+    :return: (number of records, shard paths)
+    """
+    writer = ShardWriter(directory, f"{name}-{worker:03d}", records_per_shard)
+    for k in range(games):
+        game_index = start + k
+        game = play_match(white, black, seed=seed, game_index=game_index, turn_time=turn_time)
+        if game["winner"] is not None:
+            writer.add(game_records(game["history"], game["winner"], game_index))
+    writer.close()
+    return writer.records, writer.shards
+
+def generate_self_play(games, directory=SELF_PLAY_DIR, white=SELF_PLAY_PLAYER, black=SELF_PLAY_PLAYER,
+                       workers=SELF_PLAY_WORKERS, seed=GAME_SEED, turn_time=None, records_per_shard=SHARD_RECORDS):
+    """
+    Play games of self-play split over worker processes, each streaming its positions
+    into its own rotating shard files in directory. A trainer (HeuristicNet.shard_training)
+    can consume the shards while the workers keep playing.
+
+    :return: (number of records, shard paths)
+    """
+    workers = workers or os.cpu_count()
+    name = time.strftime("%Y%m%d-%H%M%S")
+    counts = [games // workers + (1 if w < games % workers else 0) for w in range(workers)]
+    starts = np.cumsum([0] + counts[:-1]).tolist()  # first game index of every worker
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(self_play_worker, w, start, count, directory, name, white, black, seed, turn_time,
+                               records_per_shard)
+                   for w, (start, count) in enumerate(zip(starts, counts)) if count]
+        results = [future.result() for future in futures]
+    return sum(records for records, _ in results), [shard for _, shards in results for shard in shards]
+
+# ------------------------------------------------------------ reading shards
+
+def ready_shards(directory=SELF_PLAY_DIR) -> list:
+    """
+    Completed shards in directory not yet consumed, oldest name first.
+    """
+    return sorted(glob.glob(os.path.join(directory, "*" + RECORD_SUFFIX)))
+
+def open_shards(paths) -> list:
+    """
+    Memory-map every shard (see PositionRecords.read_records), without copying.
+    """
+    return [read_records(path) for path in paths]
+
+def load_shards(paths) -> np.ndarray:
+    """
+    The records of several shards as one array (a copy, for shuffling across shards).
+    """
+    shards = open_shards(paths)
+    return np.concatenate(shards) if shards else np.zeros(0, dtype=RECORD_DTYPE)
+
+def mark_consumed(paths, directory=SELF_PLAY_DIR):
+    """
+    Move shards that were trained on into the consumed subdirectory.
+    """
+    consumed = os.path.join(directory, CONSUMED_DIR)
+    os.makedirs(consumed, exist_ok=True)
+    for path in paths:
+        shutil.move(path, os.path.join(consumed, os.path.basename(path)))
+
+
+if __name__ == "__main__":
+    records, shards = generate_self_play(1000)
+    print(f"Wrote {records} positions to {len(shards)} shards in {SELF_PLAY_DIR}")
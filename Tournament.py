@@ -0,0 +1,219 @@
+import math
+import time
+from itertools import combinations
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from Constants import *
+from MatchRunner import play_match
+
+STOP_RULES = (None, STOP_SPRT, STOP_CONFIDENCE)
+
+
+def round_robin_pairings(num_players: int) -> list:
+    """
+    Every pair of players once, as (black index, white index).
+    """
+    return [(i, j) for i, j in combinations(range(num_players), 2)]
+
+def sprt_decision(wins: int, losses: int, delta=SPRT_DELTA, alpha=SPRT_ALPHA, beta=SPRT_BETA) -> int:
+    """
+    Wald's sequential probability ratio test between win rates 0.5 + delta (H1) and
+    0.5 - delta (H0) for the first player of a pairing.
+
+    :return: 1 when the first player is found stronger, -1 when the second is, 0 to keep playing
+    """
+    p0, p1 = 0.5 - delta, 0.5 + delta
+    llr = wins * math.log(p1 / p0) + losses * math.log((1 - p1) / (1 - p0))
+    if llr >= math.log((1 - beta) / alpha):
+        return 1
+    if llr <= math.log(beta / (1 - alpha)):
+        return -1
+    return 0
+
+def confidence_decision(wins: int, losses: int, z=CONFIDENCE_Z, min_games=CONFIDENCE_MIN_GAMES) -> int:
+    """
+    Normal-approximation confidence interval on the first player's win rate.
+
+    :return: 1 when the interval lies above 0.5, -1 when below, 0 to keep playing
+    """
+    games = wins + losses
+    if games < max(1, min_games):
+        return 0
+    rate = wins / games
+    margin = z * math.sqrt(max(rate * (1 - rate), 1.0 / games) / games)  # floor the variance at 0% / 100%
+    if rate - margin > 0.5:
+        return 1
+    if rate + margin < 0.5:
+        return -1
+    return 0
+
+def play_pairing(players, black_idx, white_idx, seed, game_index, turn_time):
+    """
+    Play one tournament game headless (runs in a pool process).
+
+    :return: Summary of the game: the player indices, the winner's index (None when there
+             was none), the number of turns and the seconds the game took
+    """
+    start = time.perf_counter()
+    game = play_match(players[white_idx], players[black_idx], seed=seed, game_index=game_index,
+                      turn_time=turn_time)
+    winner_idx = {WHITE: white_idx, BLACK: black_idx}.get(game["winner"])
+    return {"game_index": game_index, "black": black_idx, "white": white_idx, "winner": winner_idx,
+            "turns": len(game["moves"]), "seconds": time.perf_counter() - start}
+
+
+class Tournament:
+    def __init__(self, players, seed=GAME_SEED, workers=TOURNAMENT_WORKERS, turn_time=None,
+                 games_per_pairing=TOURNAMENT_GAMES_PER_PAIRING, stop_rule=TOURNAMENT_STOP_RULE):
+        """
+        Round-robin tournament between AI players, whose games are played in parallel by a
+        pool of worker processes and counted as they finish.
+
+        Every pair of players plays up to games_per_pairing games, swapping colors after each
+        game. With a stop rule a pair stops as soon as its result is statistically settled:
+        its games not started yet are dropped (games already running are still counted).
+        Games are submitted round by round, so every pair gets its first games early.
+
+        Use run() to play it to the end, or start() and then poll() from an event loop
+        (e.g. with window.after) to show progress while the workers play.
+
+        :param players: Player specs (see PlayerFactory.create_player); no human players
+        :param seed: Seed of the run; game i draws from the streams of game index i
+        :param workers: Number of worker processes (None uses every CPU)
+        :param turn_time: Time limit per turn for MCTS and Min-Max players (None keeps AI_TURN_TIME)
+        :param games_per_pairing: Games each pair plays (at most, with a stop rule)
+        :param stop_rule: None, STOP_SPRT (see sprt_decision) or STOP_CONFIDENCE (see confidence_decision)
+        """
+        if HUMAN in players:
+            raise ValueError("Tournaments with a human player are played on the board (BackgammonGameManager)")
+        if stop_rule not in STOP_RULES:
+            raise ValueError(f"Unknown stop rule: {stop_rule}")
+        self.players = players
+        self.seed = seed
+        self.workers = workers
+        self.turn_time = turn_time
+        self.games_per_pairing = games_per_pairing
+        self.stop_rule = stop_rule
+        self.pairings = round_robin_pairings(len(players))
+        self.pair_scores = {pairing: [0, 0] for pairing in self.pairings}  # wins of each player of the pair
+        self.decisions = {}  # pairing -> index of the player found stronger, for pairs stopped early
+        self.planned = len(self.pairings) * games_per_pairing
+        self.scores = [0] * len(players)
+        self.results = []  # Summaries of the finished games, in the order they finished
+        self.winner_idx = None
+        self.pool = None
+        self.futures = {}  # Game not yet counted -> its pairing
+
+    def __len__(self):
+        return self.planned
+
+    def schedule(self) -> list:
+        """
+        Every game as (pairing, black index, white index), round by round: the first player
+        of a pair takes black in even rounds and white in odd rounds.
+        """
+        return [(pairing, *(pairing if game % 2 == 0 else pairing[::-1]))
+                for game in range(self.games_per_pairing) for pairing in self.pairings]
+
+    def start(self):
+        """
+        Submit every game to the worker pool.
+        """
+        self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        self.futures = {
+            self.pool.submit(play_pairing, self.players, black_idx, white_idx, self.seed, game_index,
+                             self.turn_time): pairing
+            for game_index, (pairing, black_idx, white_idx) in enumerate(self.schedule())
+        }
+
+    def poll(self) -> list:
+        """
+        Count the games that finished since the last call, without waiting.
+
+        :return: Their summaries (see play_pairing)
+        :raises: The exception of a game that failed in its worker, after cancelling the rest
+        """
+        results = []
+        for future in [future for future in self.futures if future.done()]:
+            if future in self.futures:  # not dropped by a stop decided meanwhile
+                results.append(self.collect(future))
+        return results
+
+    def run(self, on_result=None) -> tuple:
+        """
+        Play the whole tournament, waiting for the workers.
+
+        :param on_result: Called with each game's summary as it finishes
+        :return: (scores, winner_idx)
+        """
+        self.start()
+        try:
+            for future in as_completed(list(self.futures)):
+                if future not in self.futures:
+                    continue  # dropped by a stop rule
+                result = self.collect(future)
+                if on_result:
+                    on_result(result)
+            self.finish()
+        finally:
+            self.cancel()  # nothing left to release unless a game or on_result raised
+        return self.scores, self.winner_idx
+
+    def collect(self, future) -> dict:
+        pairing = self.futures.pop(future)
+        try:
+            result = future.result()
+        except Exception:
+            self.cancel()  # a failed game leaves the tournament without a result
+            raise
+        self.record(pairing, result)
+        return result
+
+    def record(self, pairing: tuple, result: dict):
+        self.results.append(result)
+        if result["winner"] is not None:
+            self.scores[result["winner"]] += 1
+            self.pair_scores[pairing][pairing.index(result["winner"])] += 1
+        if self.stop_rule is not None and pairing not in self.decisions:
+            wins, losses = self.pair_scores[pairing]
+            if self.stop_rule == STOP_SPRT:
+                decision = sprt_decision(wins, losses)
+            else:
+                decision = confidence_decision(wins, losses)
+            if decision:
+                self.decisions[pairing] = pairing[0] if decision > 0 else pairing[1]
+                self.drop_games(pairing)
+        if self.is_done():
+            self.finish()
+
+    def drop_games(self, pairing: tuple):
+        """
+        Cancel the games of pairing that have not started yet.
+        """
+        for future, future_pairing in list(self.futures.items()):
+            if future_pairing == pairing and future.cancel():
+                del self.futures[future]
+                self.planned -= 1
+
+    def is_done(self) -> bool:
+        return len(self.results) == self.planned
+
+    def cancel(self):
+        """
+        Drop the games not started yet and release the pool (e.g. when the window closes
+        or a game failed).
+        """
+        for future in self.futures:
+            future.cancel()
+        self.futures.clear()
+        if self.pool is not None:
+            self.pool.shutdown(wait=False)
+            self.pool = None
+
+    def finish(self):
+        """
+        Shut the pool down and pick the winner (the first player with the most wins).
+        """
+        if self.pool is not None:
+            self.pool.shutdown(wait=False)
+            self.pool = None
+        self.winner_idx = self.scores.index(max(self.scores))
@@ -1,5 +1,6 @@
 import os
 import glob
+import traceback
 from tkinter import *
 from Constants import (
     RAND_AI, HEUR_AI, MIN_MAX_AI, MCTS_AI, NEURAL_AI, HUMAN,
@@ -357,6 +358,93 @@ class TournamentSetupWindow:
         self.window.geometry("")  # Reset to auto-size for the game board
 
 
+class TournamentProgressScreen:
+    """
+    Progress screen shown while a Tournament's games are played by its worker processes.
+    The games run off the Tk event loop; this screen only polls for finished games and
+    shows the running scores, then calls on_complete(players, scores, winner_idx).
+    If a game fails in its worker the tournament is cancelled and the error is shown instead.
+    """
+
+    POLL_MS = 200
+
+    def __init__(self, window, tournament, on_complete):
+        self.window = window
+        self.tournament = tournament
+        self.on_complete = on_complete
+
+        self._build_ui()
+        self.tournament.start()
+        self.window.after(self.POLL_MS, self._poll)
+
+    # ------------------------------------------------------------------ layout
+
+    def _build_ui(self):
+        self.window.title("Backgammon — Tournament in progress")
+
+        self.frame = Frame(self.window, padx=30, pady=30)
+        self.frame.pack(fill=BOTH, expand=True)
+
+        Label(self.frame, text="Tournament in Progress",
+              font=("Helvetica", 18, "bold")).pack(pady=(0, 6))
+
+        self.progress_label = Label(self.frame, font=("Helvetica", 13))
+        self.progress_label.pack(pady=(0, 18))
+
+        table = Frame(self.frame, relief=GROOVE, bd=1)
+        table.pack(fill=X, pady=(0, 20))
+        self.score_labels = []
+        for row, spec in enumerate(self.tournament.players):
+            bg = "white" if row % 2 == 0 else "#f5f5f5"
+            Label(table, text=player_spec_label(spec), width=28, bg=bg,
+                  pady=3, anchor=W).grid(row=row, column=0, sticky=NSEW)
+            score = Label(table, width=6, bg=bg, pady=3)
+            score.grid(row=row, column=1, sticky=NSEW)
+            self.score_labels.append(score)
+
+        self.last_result_label = Label(self.frame, fg="#555555")
+        self.last_result_label.pack()
+        self._update()
+
+    def _update(self, results=()):
+        tournament = self.tournament
+        self.progress_label.config(text=f"Games finished: {len(tournament.results)} / {len(tournament)}")
+        for label, score in zip(self.score_labels, tournament.scores):
+            label.config(text=str(score))
+        if results:
+            result = results[-1]
+            players = tournament.players
+            winner = player_spec_label(players[result["winner"]]) if result["winner"] is not None else "nobody"
+            self.last_result_label.config(
+                text=f"{player_spec_label(players[result['white']])} vs {player_spec_label(players[result['black']])}: "
+                     f"{winner} won in {result['turns']} turns"
+            )
+
+    # ----------------------------------------------------------------- actions
+
+    def _poll(self):
+        if not self.frame.winfo_exists():
+            self.tournament.cancel()
+            return
+        try:
+            results = self.tournament.poll()
+        except Exception as error:
+            # The tournament cancelled its other games; stop polling and show why
+            traceback.print_exc()
+            self.progress_label.config(text="Tournament stopped: a game failed", fg="#b00020")
+            self.last_result_label.config(text=f"{type(error).__name__}: {error}", fg="#b00020")
+            return
+        self._update(results)
+        if self.tournament.is_done():
+            tournament = self.tournament
+            self.on_complete(tournament.players, tournament.scores, tournament.winner_idx)
+        else:
+            self.window.after(self.POLL_MS, self._poll)
+
+    def destroy(self):
+        self.frame.destroy()
+
+
 class TournamentResultsScreen:
     """
     Results screen shown after all tournament games complete.
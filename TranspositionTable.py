@@ -0,0 +1,60 @@
+from collections import OrderedDict
+from Constants import TT_SIZE
+
+
+class TranspositionTable:
+    def __init__(self, max_size=TT_SIZE):
+        """
+        Bounded cache of searched positions, keyed by a Zobrist position hash.
+        Each entry stores (depth, value); the least recently used entry is evicted
+        once max_size is exceeded.
+
+        :param max_size: Maximum number of positions kept.
+        """
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.reset_stats()
+
+    def reset_stats(self):
+        """
+        Clear the hit/miss counters (e.g. at the start of a turn).
+        """
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def probe(self, key, depth):
+        """
+        Return the stored value for key if it was searched at least depth deep, else None.
+        """
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] >= depth:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        return None
+
+    def store(self, key, depth, value):
+        """
+        Save the value of a position searched to depth. A deeper existing entry is kept.
+        """
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] > depth:
+            return
+        self.entries[key] = (depth, value)
+        self.entries.move_to_end(key)
+        self.stores += 1
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def hit_rate(self):
+        probes = self.hits + self.misses
+        return self.hits / probes if probes else 0.0
+
+    def clear(self):
+        self.entries.clear()
+        self.reset_stats()
+
+    def __len__(self):
+        return len(self.entries)
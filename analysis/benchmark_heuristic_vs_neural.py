@@ -1,77 +1,47 @@
 import sys, os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-import time
 import numpy as np
 from Constants import *
-from BackgammonGameManager import BackgammonGameManager
-from tkinter import Tk
+from Tournament import Tournament
 import matplotlib.pyplot as plt
 
 
-def wait_until(somepredicate, timeout, period=0.25):
-    """Wait for a condition to be true or timeout expires."""
-    mustend = time.time() + timeout
-    while time.time() < mustend:
-        if somepredicate(): 
-            return True
-        time.sleep(period)
-    return False
-
-def run_comparison_games(num_games=10, timeout_per_game=5):
+def run_comparison_games(num_games=10, seed=GAME_SEED, stop_rule=None):
     """
     Run multiple games between heuristic player and neural network player.
+    The players swap colors after every game.
     
     Args:
-        num_games: Number of games to run
-        timeout_per_game: Maximum time in seconds to wait for each game to complete
+        num_games: Number of games to run (at most, with a stop rule)
+        seed: Seed of the run (None for unseeded games)
+        stop_rule: None, STOP_SPRT or STOP_CONFIDENCE to stop once the result is settled
         
     Returns:
         dict: Statistics about the game results
     """
-    # Create a root window for Tkinter (can be hidden)
-    root = Tk()
-    root.withdraw()  # Hide the window
-    
-    # Initialize counters
-    heuristic_wins = 0
-    neural_wins = 0
-    games_played = 0
-    game_results = []
-    
-    # Run the specified number of games
-    for game_num in range(1, num_games + 1):
-        games_played += 1
-        print(f"\nStarting game {game_num} of {num_games}...")
+    neural_player = [NEURAL_AI, "HeuristicNets/newformat07.03.pth"]
+    tournament = Tournament([HEUR_AI, neural_player], seed=seed, games_per_pairing=num_games, stop_rule=stop_rule)
 
-        neural_player = [NEURAL_AI, "HeuristicNets/newformat07.03.pth"]
-        players = [HEUR_AI, neural_player] if game_num % 2 == 0 else [neural_player, HEUR_AI] #alternating players in order to achieve fair colors
-        
-        # Create a new game with heuristic player (player 1) vs neural player (player 2)
-        game_manager = BackgammonGameManager(root, players) 
-        
-        # Wait for the game to complete or timeout
-        wait_until(lambda gm=game_manager: gm.is_over, 
-                                   timeout=timeout_per_game, period=0.5)
-                
-        
-        # Determine the winner
-        winner = game_manager.winner_idx
-        winner = winner if game_num % 2 == 0 else 1-winner
-        if winner == 0:  # Heuristic player won
-            heuristic_wins += 1
-            result = "Heuristic player won"
-        else:  # Neural player won
-            neural_wins += 1
-            result = "Neural player won"
-        
-        print(f"Game {game_num} result: {result}")
+    # Results of each game, as they finish
+    game_results = []
 
+    def on_result(game):
+        # Winner 0 for the heuristic player, 1 for the neural player
+        winner = game["winner"]
+        result = "Heuristic player won" if winner == 0 else "Neural player won"
+        print(f"Game {game['game_index'] + 1} result: {result}")
         game_results.append({
-            "game_number": game_num,
+            "game_number": game["game_index"] + 1,
             "winner": winner,
             "result": result
         })
+
+    # Play the games on every CPU
+    scores, _ = tournament.run(on_result)
+    heuristic_wins, neural_wins = scores
+    games_played = len(game_results)
+    game_results.sort(key=lambda game: game["game_number"])
     
     # Calculate win percentages
     heuristic_win_pct = (heuristic_wins / games_played) * 100 if games_played > 0 else 0
@@ -86,9 +56,6 @@ def run_comparison_games(num_games=10, timeout_per_game=5):
     print(f"Neural player wins: {neural_wins} ({neural_win_pct:.1f}%)")
     print("="*50)
     
-    # Close the Tkinter window
-    root.destroy()
-    
     # Return statistics
     return {
         "games_played": games_played,
@@ -142,8 +109,8 @@ def visualize_results(results):
     return error
 
 if __name__ == "__main__":
-    # Run 10 games between heuristic and neural players
-    results = run_comparison_games(num_games=30)
+    # Run up to 200 games between heuristic and neural players, stopping once the SPRT settles
+    results = run_comparison_games(num_games=200, stop_rule=STOP_SPRT)
     
     # Visualize the results and get error metric
     #error = visualize_results(results)
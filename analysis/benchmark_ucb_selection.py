@@ -0,0 +1,74 @@
+import sys, os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import math
+import random
+import timeit
+from Constants import *
+from BoardTree import BoardNode
+from NodeStore import NodeStore
+
+
+def build_nodes(width, seed=0):
+    """
+    Build the same node of `width` visited children as BoardNodes and in a NodeStore.
+
+    Returns:
+        tuple: (BoardNode parent, NodeStore, parent index in the store)
+    """
+    rng = random.Random(seed)
+    stats = [(rng.randint(1, 50), rng.random()) for _ in range(width)]
+
+    parent = BoardNode(START_BOARD, 0.0, [], WHITE)
+    for visits, mean in stats:
+        parent.add_child(BoardNode(START_BOARD, 0.0, [], BLACK, visits=visits, wins=visits * mean))
+    parent.visits = sum(visits for visits, _ in stats)
+
+    store = NodeStore()
+    node = store.add_root(START_BOARD, WHITE)
+    first = store.allocate(width)
+    store.first_child[node], store.child_count[node], store.expanded[node] = first, width, width
+    for child, (visits, mean) in enumerate(stats, first):
+        store.parent[child] = node
+        store.visits[child] = visits
+        store.value_sum[child] = visits * mean
+    store.visits[node] = parent.visits
+    return parent, store, node
+
+def python_loop_ucb(store, node, c=MCTS_C, direction=1):
+    """Per-child Python loop over the store arrays (what best_ucb_child did before vectorizing)."""
+    best_child, best_ucb = -1, float("-inf")
+    for child in store.children(node):
+        ucb = direction * store.value_sum[child] / store.visits[child] \
+            + c * (math.log(store.visits[node]) / store.visits[child]) ** 0.5
+        if ucb > best_ucb:
+            best_child, best_ucb = child, ucb
+    return best_child
+
+def run_benchmark(widths=(8, 32, 128, 512), number=2000):
+    """
+    Time one UCB selection per implementation for nodes of each width.
+
+    Returns:
+        dict: width -> {implementation: microseconds per selection}
+    """
+    results = {}
+    for width in widths:
+        parent, store, node = build_nodes(width)
+        assert store.best_ucb_child(node) - store.first_child[node] == parent.children.index(parent.get_best_ucb_child())
+        assert store.best_ucb_child(node) == python_loop_ucb(store, node)
+        results[width] = {
+            "BoardNode.get_best_ucb_child": timeit.timeit(parent.get_best_ucb_child, number=number),
+            "store, Python loop": timeit.timeit(lambda: python_loop_ucb(store, node), number=number),
+            "store, vectorized": timeit.timeit(lambda: store.best_ucb_child(node), number=number),
+        }
+        results[width] = {name: seconds / number * 1e6 for name, seconds in results[width].items()}
+    return results
+
+
+if __name__ == "__main__":
+    results = run_benchmark()
+    names = list(next(iter(results.values())))
+    print(f"{'children':>8}  " + "  ".join(f"{name:>28}" for name in names) + "   (µs per selection)")
+    for width, timings in results.items():
+        print(f"{width:>8}  " + "  ".join(f"{timings[name]:>28.1f}" for name in names))
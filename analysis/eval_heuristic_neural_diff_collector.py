@@ -1,22 +1,13 @@
 import sys, os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-import time
 import numpy as np
 from Constants import *
-from BackgammonGameManager import BackgammonGameManager
+from MatchRunner import play_match
 from Eval_position import evaluate_position
 from HeuristicNet import neural_eval
-from tkinter import Tk
 
-def wait_until(somepredicate, timeout, period=0.25, *args, **kwargs):
-  mustend = time.time() + timeout
-  while time.time() < mustend:
-    if somepredicate(*args, **kwargs): return True
-    time.sleep(period)
-  return False
-
-def run_evaluation_comparison(num_games=4, target_boards=200):
+def run_evaluation_comparison(num_games=4, target_boards=200, seed=GAME_SEED):
     """
     Run multiple games against a random player, collect board states,
     calculate heuristic and network values, and compute statistics.
@@ -24,6 +15,7 @@ def run_evaluation_comparison(num_games=4, target_boards=200):
     Args:
         num_games: Minimum number of games to run
         target_boards: Target number of board states to collect
+        seed: Seed of the run (None for unseeded games)
         
     Returns:
         dict: Statistics about the differences between heuristic and network evaluations
@@ -34,25 +26,15 @@ def run_evaluation_comparison(num_games=4, target_boards=200):
     board_count = 0
     games_played = 0
     
-    # Create a root window for Tkinter (can be hidden)
-    root = Tk()
-    root.withdraw()  # Hide the window
-        
     # Run games until we have enough board states
     while board_count < target_boards:
         games_played += 1
         print(f"Starting game {games_played}...")
         
-        # Create a new game
-        game_manager = BackgammonGameManager(root, [NEURAL_AI, RAND_AI])
-        
-        # Play the game and collect board states
-        wait_until(lambda gm=game_manager: gm.is_over(), timeout=1, period=0.5)
-        
-        # Add all board states from this game to our collection
-        if hasattr(game_manager, 'board_history') and game_manager.board_history:
-            boards.extend(game_manager.board_history)
-            board_count = len(boards)
+        # Play a game headless and collect its board states
+        game = play_match(RAND_AI, NEURAL_AI, seed=seed, game_index=games_played)
+        boards.extend(game["history"])
+        board_count = len(boards)
         
         print(f"Game {games_played} completed. Total board states: {board_count}")
     
@@ -85,9 +67,6 @@ def run_evaluation_comparison(num_games=4, target_boards=200):
     print(f"Average difference (Heuristic - Network): {mean_diff:.4f}")
     print(f"Variance of differences: {variance_diff:.4f}")
     
-    # Close the Tkinter window
-    root.destroy()
-    
     # Return statistics
     return {
         "games_played": games_played,
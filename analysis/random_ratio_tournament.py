@@ -1,17 +1,20 @@
 import sys, os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from tkinter import Tk
-from BackgammonGameManager import BackgammonGameManager
-from Constants import EVAL_DISTRIBUTION, NETWORK_TRAINING, HEUR_AI
+from concurrent.futures import ProcessPoolExecutor
+from Constants import EVAL_DISTRIBUTION, HEUR_AI, GAME_SEED, TOURNAMENT_WORKERS
+from Ratings import RatingTable
+from RandomStreams import make_rng
 
 import random
 
-NUM_AI_PLAYERS = 5  # Adjust the number of AI players
+NUM_AI_PLAYERS = 200  # Number of random ratio vectors added to the pool per run
 UNIT_RATIO = 0.05  # Ratio unit (0.05 = 1/20)
+NUM_ROUNDS = 40  # Rating rounds per run; every bot plays about one game per round
+RATINGS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ratio_ratings.json")
 
 
-def generate_random_ratios():
+def generate_random_ratios(rng=random):
     total_units = int(1.0/UNIT_RATIO)             # Total number of units
     num_factors = len(EVAL_DISTRIBUTION)            # Number of ratios to generate
 
@@ -20,13 +23,13 @@ def generate_random_ratios():
     remaining = total_units
     for _ in range(num_factors - 1):
         # Ensure each ratio is at least 1 (UNIT_RATIO when scaled)
-        r = random.randint(0, remaining) # Generate a random integer between 0 (min_value) and remaining (max_value)
+        r = rng.randint(0, remaining) # Generate a random integer between 0 (min_value) and remaining (max_value)
         ratios.append(r)
         remaining -= r
     ratios.append(remaining)  # Assign the remaining units to the last ratio
 
     # Shuffle the ratios to randomize their order
-    random.shuffle(ratios)
+    rng.shuffle(ratios)
 
     return {
         "prime_structure": ratios[0] * UNIT_RATIO,
@@ -37,32 +40,36 @@ def generate_random_ratios():
         "captured_pieces": ratios[5] * UNIT_RATIO
     }
 
-def print_players_ratios(players):
-    i=0
-    for player in players:
-        if player[0] == "AI":
-            print(f"AI player {i} with ratios: {player[1]}")
-        i += 1
-
-def turnament():
-    window = Tk()
-    window.title("Backgammon AI Tournament")
-
-    if NETWORK_TRAINING:
-        players = [HEUR_AI] * NUM_AI_PLAYERS  # Generate a list of AI players
-    else: # Generate a list of AI players with random ratios
-        players = [HEUR_AI]
-        for _ in range(NUM_AI_PLAYERS):
-            ratios = generate_random_ratios()
-            players.append([HEUR_AI, ratios])
-
-    # Initialize the game GUI with the list of players
-    game_gui = BackgammonGameManager(window, players)
-
-    # Start the GUI event loop
-    window.mainloop()
-
-    print_players_ratios(players)
+def print_leaderboard(table, top=20):
+    print(f"{'rank':>4}  {'rating':>6}  {'95% interval':>13}  {'games':>5}  ratios")
+    for rank, i in enumerate(table.leaderboard()[:top], 1):
+        low, high = table.interval(i)
+        spec = table.specs[i]
+        ratios = spec[1] if isinstance(spec, list) else EVAL_DISTRIBUTION
+        print(f"{rank:>4}  {table.ratings[i]:>6.0f}  {low:>6.0f}-{high:<6.0f}  {table.games[i]:>5}  "
+              + " ".join(f"{value:.2f}" for value in ratios.values()))
+
+def turnament(seed=GAME_SEED, num_players=NUM_AI_PLAYERS, rounds=NUM_ROUNDS, path=RATINGS_PATH):
+    """
+    Screen random heuristic weightings by rating them against each other and against
+    the default weights. The rating table is kept in path, so every run adds
+    num_players new vectors to the pool and refines the ratings of the old ones.
+    """
+    table = RatingTable.load(path)
+    table.add(HEUR_AI)
+    rng = make_rng(seed, "ratios", len(table))
+    for _ in range(num_players):
+        table.add([HEUR_AI, generate_random_ratios(rng)])
+    print(f"Rating {len(table)} players over {rounds} rounds")
+
+    with ProcessPoolExecutor(max_workers=TOURNAMENT_WORKERS) as pool:
+        for round_number in range(1, rounds + 1):
+            table.play_round(seed=seed, pool=pool)
+            print(f"Round {round_number}/{rounds}: {table.games_played} games rated")
+    table.save(path)
+
+    print_leaderboard(table)
+    return table
 
 
 
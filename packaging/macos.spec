@@ -4,15 +4,17 @@
 # Must be built on a Mac (PyInstaller only targets the OS it runs on).
 # Build: python -m PyInstaller packaging/macos.spec
 import os
-from PyInstaller.utils.hooks import collect_all
 
 ROOT = os.path.dirname(SPECPATH)
 
-datas = [(os.path.join(ROOT, 'HeuristicNets', '*.pth'), 'HeuristicNets/')]
+datas = [
+    (os.path.join(ROOT, 'HeuristicNets', '*.pth'), 'HeuristicNets/'),
+    (os.path.join(ROOT, 'HeuristicNets', '*.npz'), 'HeuristicNets/'),
+]
 binaries = []
-hiddenimports = ['torch']
-tmp_ret = collect_all('torch')
-datas += tmp_ret[0]; binaries += tmp_ret[1]; hiddenimports += tmp_ret[2]
+# Play only needs NumPy and the exported .npz weights (python HeuristicNetNumpy.py);
+# torch is used for training and is left out of the build.
+hiddenimports = []
 
 
 a = Analysis(
@@ -24,7 +26,7 @@ a = Analysis(
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes=['torch'],
     noarchive=False,
     optimize=0,
 )
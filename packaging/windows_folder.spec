@@ -4,13 +4,15 @@
 # Users extract the zip and run BackgammonAI.exe from inside it.
 # Build: python -m PyInstaller packaging/windows_folder.spec
 import os
-from PyInstaller.utils.hooks import collect_all
 
 # SPECPATH is the directory containing this spec file (packaging/).
 # ROOT is the project root one level up.
 ROOT = os.path.dirname(SPECPATH)
 
-datas = [(os.path.join(ROOT, 'HeuristicNets', '*.pth'), 'HeuristicNets/')]
+datas = [
+    (os.path.join(ROOT, 'HeuristicNets', '*.pth'), 'HeuristicNets/'),
+    (os.path.join(ROOT, 'HeuristicNets', '*.npz'), 'HeuristicNets/'),
+]
 # Place pythonXXX.dll next to the exe so Windows finds it regardless of
 # which directory the user launches from (Windows checks the exe's own
 # directory first in its DLL search order).
@@ -20,9 +22,9 @@ _py_dll = os.path.join(
     f'python{sys.version_info.major}{sys.version_info.minor}.dll',
 )
 binaries = [(_py_dll, '.')]
-hiddenimports = ['torch']
-tmp_ret = collect_all('torch')
-datas += tmp_ret[0]; binaries += tmp_ret[1]; hiddenimports += tmp_ret[2]
+# Play only needs NumPy and the exported .npz weights (python HeuristicNetNumpy.py);
+# torch is used for training and is left out of the build.
+hiddenimports = []
 
 
 a = Analysis(
@@ -34,7 +36,7 @@ a = Analysis(
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[os.path.join(SPECPATH, 'hooks', 'rthook_dlldir.py')],
-    excludes=[],
+    excludes=['torch'],
     noarchive=False,
     optimize=0,
 )
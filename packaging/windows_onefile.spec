@@ -1,20 +1,22 @@
 # -*- mode: python ; coding: utf-8 -*-
 # Windows — single-file build
 # Produces one portable BackgammonAI.exe that works from any directory.
-# First launch is slow (~60s) while PyTorch extracts to a temp folder.
+# First launch is a little slower while the bundle extracts to a temp folder.
 # Build: python -m PyInstaller packaging/windows_onefile.spec
 import os
-from PyInstaller.utils.hooks import collect_all
 
 # SPECPATH is the directory containing this spec file (packaging/).
 # ROOT is the project root one level up.
 ROOT = os.path.dirname(SPECPATH)
 
-datas = [(os.path.join(ROOT, 'HeuristicNets', '*.pth'), 'HeuristicNets/')]
+datas = [
+    (os.path.join(ROOT, 'HeuristicNets', '*.pth'), 'HeuristicNets/'),
+    (os.path.join(ROOT, 'HeuristicNets', '*.npz'), 'HeuristicNets/'),
+]
 binaries = []
-hiddenimports = ['torch']
-tmp_ret = collect_all('torch')
-datas += tmp_ret[0]; binaries += tmp_ret[1]; hiddenimports += tmp_ret[2]
+# Play only needs NumPy and the exported .npz weights (python HeuristicNetNumpy.py);
+# torch is used for training and is left out of the build.
+hiddenimports = []
 
 
 a = Analysis(
@@ -26,7 +28,7 @@ a = Analysis(
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes=['torch'],
     noarchive=False,
     optimize=0,
 )
@@ -1,8 +1,10 @@
 import sys
 import msvcrt
+import multiprocessing
 from tkinter import Tk
 from BackgammonGameManager import BackgammonGameManager
-from TournamentSetup import TournamentSetupWindow, TournamentResultsScreen
+from Tournament import Tournament
+from TournamentSetup import TournamentSetupWindow, TournamentResultsScreen, TournamentProgressScreen
 from Constants import *
 
 
@@ -41,9 +43,16 @@ class GameLooper:
             if on_complete:
                 on_complete(players, scores, winner_idx)
 
-        self.current_game = BackgammonGameManager(
-            window, self.players, self.start_board, on_complete=_on_done
-        )
+        if HUMAN in self.players or WATCH_AI_GAMES:
+            # Games with a human (or watched on the board) are played one at a time on the event loop
+            self.current_game = BackgammonGameManager(
+                window, self.players, self.start_board, on_complete=_on_done
+            )
+        else:
+            # AI-only tournaments are played by worker processes; the window only shows progress
+            self.current_game = TournamentProgressScreen(
+                window, Tournament(self.players), on_complete=_on_done
+            )
         self.game_in_progress = True
 
 def main():
@@ -74,4 +83,5 @@ def main():
     window.mainloop()
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # MCTS worker processes in the packaged executable
     main()
\ No newline at end of file
@@ -5,10 +5,28 @@ Run with: python -m pytest tests/
 import sys, os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
-from Constants import START_BOARD, WHITE, BLACK, EVAL_DISTRIBUTION
+from Constants import START_BOARD, WHITE, BLACK, EVAL_DISTRIBUTION, PATH, RAND_AI, HEUR_AI, MCTS_AI, MIN_MAX_AI, HUMAN
 from BoardTree import BoardNode
 from Eval_position import evaluate_position, count_weighted_blots
 from Players.Player import Player
+from ModelRegistry import ModelRegistry
+from TranspositionTable import TranspositionTable
+from Players.Min_Max_Player import Min_Max_Player
+from Board import Board
+from MoveGenerator import generate_moves, ROLLS, ROLL_INDEX, TARGETS
+import numpy as np
+from HeuristicNetNumpy import neural_eval_batch
+from Rollout import rollout, play_turn, greedy_gain, greedy_score
+from Players.MCTS_Player import MCTS_Player
+from NodeStore import NodeStore, NO_NODE
+from RandomStreams import make_rng, roll_dice
+from Players.Random_Player import Random_Player
+from MatchRunner import play_match
+from Tournament import Tournament, round_robin_pairings, sprt_decision, confidence_decision
+from Ratings import RatingTable
+from SelfPlay import game_records, ShardWriter, generate_self_play, ready_shards, load_shards, mark_consumed
+from PositionRecords import RECORD_DTYPE, make_records, write_records, read_records, network_inputs
+import random
 
 
 # ── BoardTree ──────────────────────────────────────────────────────────────────
@@ -125,3 +143,745 @@ class TestGenerateAllMoves:
         moves = p.generate_all_moves(board, [1, 2])
         # Result should be [[]] — one entry meaning "no moves possible"
         assert moves == [[]]
+
+    def test_doubles_yield_distinct_positions(self):
+        results = generate_moves(START_BOARD.copy(), [6, 6, 6, 6], WHITE)
+        positions = [board.cells for _, board in results]
+        assert len(positions) == len(set(positions))
+        assert all(len(moves) == 4 for moves, _ in results)
+
+    def test_sequence_reaches_its_board(self):
+        p = Player(BLACK, START_BOARD.copy())
+        for moves, board in p.generate_all_moves_with_boards(START_BOARD.copy(), [5, 3]):
+            assert p.simulate_moves(START_BOARD.copy(), moves) == board.to_list()
+
+    def test_must_play_both_dice_when_possible(self):
+        board = [0] * 28
+        board[0] = 1
+        board[3] = -2      # after 0->1 or 0->2 this piece cannot use the other die
+        board[20] = 1
+        board[26] = 13
+        board[27] = 13
+        moves = Player(WHITE, board).generate_all_moves(board, [2, 1])
+        assert moves and all(len(seq) == 2 for seq in moves)
+
+    def test_must_play_larger_die_if_only_one_fits(self):
+        board = [0] * 28
+        board[0] = 1
+        board[7] = -2      # either die can be played, but not both
+        board[26] = 14
+        board[27] = 13
+        moves = Player(WHITE, board).generate_all_moves(board, [2, 5])
+        assert moves == [[(0, 5)]]
+
+
+
+class TestMoveTables:
+    def test_21_rolls_cover_all_outcomes(self):
+        assert len(ROLLS) == 21
+        assert abs(sum(probability for _, probability in ROLLS) - 1.0) < 1e-9
+
+    def test_targets_match_player_arithmetic(self):
+        assert TARGETS[WHITE][24][3] == 2     # white enters from the bar
+        assert TARGETS[BLACK][25][3] == 21    # black enters from the bar
+        assert TARGETS[WHITE][22][5] == 26    # white bears off
+        assert TARGETS[BLACK][10][4] == 6
+
+
+# ── Board ──────────────────────────────────────────────────────────────────────
+
+class TestBoard:
+    def test_start_board_pips(self):
+        board = Board(START_BOARD)
+        assert board.pip_count(WHITE) == 167
+        assert board.pip_count(BLACK) == 167
+
+    def test_behaves_like_list(self):
+        board = Board(START_BOARD)
+        assert board == START_BOARD
+        assert list(board) == START_BOARD
+        assert board[0] == 2 and len(board) == 28
+
+    def test_apply_returns_new_board(self):
+        board = Board(START_BOARD)
+        moved = board.apply((0, 1), WHITE)
+        assert board == START_BOARD
+        assert moved[0] == 1 and moved[1] == 1
+        assert moved.pip_count(WHITE) == 166
+
+    def test_apply_hit_updates_caches(self):
+        cells = [0] * 28
+        cells[3] = 1     # white blot
+        cells[5] = -2    # black made point
+        board = Board(cells).apply((5, 3), BLACK)
+        assert board[24] == 1 and board[3] == -1 and board[5] == -1
+        assert board.blots(BLACK) == (1 << 3) | (1 << 5)
+        assert board.made_points(BLACK) == 0
+        assert board.occupancy(WHITE) == 0
+        assert board.pip_count(WHITE) == 25
+        assert not board.all_home(WHITE)
+
+    def test_incremental_caches_match_rebuild(self):
+        board = Board(START_BOARD)
+        for move, color in [((0, 3), WHITE), ((12, 9), BLACK), ((3, 9), WHITE), ((25, 20), BLACK)]:
+            board = board.apply(move, color)
+            rebuilt = Board(board.to_list())
+            for slot in Board.__slots__:
+                assert getattr(board, slot) == getattr(rebuilt, slot)
+
+    def test_zobrist_depends_on_side_to_move(self):
+        board = Board(START_BOARD)
+        assert board.position_hash(WHITE) != board.position_hash(BLACK)
+
+    def test_transposed_moves_hash_equal(self):
+        board = Board(START_BOARD)
+        first = board.apply((0, 3), WHITE).apply((11, 13), WHITE)
+        second = board.apply((11, 13), WHITE).apply((0, 3), WHITE)
+        assert first.zobrist == second.zobrist
+
+
+# ── Transposition table ────────────────────────────────────────────────────────
+
+class TestTranspositionTable:
+    def test_probe_requires_enough_depth(self):
+        table = TranspositionTable()
+        table.store(1, 1, 0.7)
+        assert table.probe(1, 1) == 0.7
+        assert table.probe(1, 0) == 0.7
+        assert table.probe(1, 2) is None
+        assert table.hits == 2 and table.misses == 1
+
+    def test_bounded_size(self):
+        table = TranspositionTable(max_size=2)
+        for key in range(3):
+            table.store(key, 0, 0.5)
+        assert len(table) == 2
+        assert table.probe(0, 0) is None
+
+    def test_min_max_reuses_positions(self):
+        p = Min_Max_Player(WHITE, START_BOARD.copy(), depth=1)
+        p.choose_move(START_BOARD.copy(), [3, 1])
+        p.choose_move(START_BOARD.copy(), [3, 1])
+        assert p.evaluation_cache.misses == 0
+        assert p.evaluation_cache.hits > 0
+
+    def test_leaves_ignore_searched_values(self):
+        p = Min_Max_Player(WHITE, START_BOARD.copy(), depth=1)
+        board = Board(START_BOARD.copy())
+        p.transposition_table.store(board.position_hash(BLACK), 2, 0.123)
+        assert p.static_evaluation(board, BLACK) == evaluate_position(START_BOARD.copy(), EVAL_DISTRIBUTION)
+
+
+# ── Min-max search ─────────────────────────────────────────────────────────────
+
+def _reference_expectiminimax(board, color, depth, roll=None):
+    """Unpruned expectiminimax used to check the pruned search."""
+    other = BLACK if color == WHITE else WHITE
+    if roll is None:
+        if depth == 0 or board[26] == 15 or board[27] == 15:
+            return evaluate_position(list(board), EVAL_DISTRIBUTION)
+        return sum(p * _reference_expectiminimax(board, color, depth, r) for r, p in ROLLS)
+    values = [_reference_expectiminimax(b, other, depth - 1) for _, b in generate_moves(board, roll, color)]
+    return max(values) if color == WHITE else min(values)
+
+
+class TestExpectiminimax:
+    def _endgame(self):
+        board = [0] * 28
+        board[20], board[22] = 1, 2     # white home board
+        board[1], board[3] = -2, -1     # black home board
+        board[26], board[27] = 12, 12
+        return board
+
+    def test_pruned_search_matches_full_search(self):
+        board = self._endgame()
+        for color, roll in [(WHITE, [2, 1]), (BLACK, [4, 4, 4, 4])]:
+            p = Min_Max_Player(color, board.copy(), depth=2)
+            move = p.choose_move(board.copy(), roll)
+            other = BLACK if color == WHITE else WHITE
+            chosen = _reference_expectiminimax(Board(board).apply_moves(move, color), other, 1)
+            best = _reference_expectiminimax(Board(board), color, 2, roll)
+            assert abs(chosen - best) < 1e-9
+
+    def test_iterative_matches_fixed_depth(self):
+        board = self._endgame()
+        fixed = Min_Max_Player(WHITE, board.copy(), depth=2, iterative=False)
+        deepening = Min_Max_Player(WHITE, board.copy(), depth=2, iterative=True)
+        assert deepening.choose_move(board.copy(), [2, 1], time=60) == fixed.choose_move(board.copy(), [2, 1])
+        assert deepening.completed_depth == 2
+
+    def test_depth_one_completes_without_time(self):
+        p = Min_Max_Player(WHITE, START_BOARD.copy(), depth=3, iterative=True)
+        move = p.choose_move(START_BOARD.copy(), [3, 1], time=0)
+        assert p.completed_depth == 1
+        assert move in p.generate_all_moves(START_BOARD.copy(), [3, 1])
+
+    def test_plays_the_best_searched_move_not_a_tied_bound(self):
+        # The second move is searched first and is best; the first move's search only returns
+        # a fail-soft bound equal to it, and earlier code picked it for coming first
+        p = Min_Max_Player(WHITE, START_BOARD.copy(), depth=1, iterative=False)
+        boards = [tuple(new_board) for _, new_board in p.generate_all_moves_with_boards(Board(START_BOARD), [3, 1])]
+        static = {board: 0.1 for board in boards}
+        static[boards[0]], static[boards[1]] = 0.8, 0.9
+        p.static_evaluation = lambda board, turn: static[tuple(board)]
+        p.search_rolls = lambda board, turn, depth, alpha, beta: 0.6
+        move = p.choose_move(START_BOARD.copy(), [3, 1])
+        assert Board(START_BOARD).apply_moves(move, WHITE).cells == boards[1]
+
+    def test_only_root_children_are_kept(self):
+        board = self._endgame()
+        p = Min_Max_Player(BLACK, board.copy(), depth=2, iterative=False)
+        p.choose_move(board.copy(), [4, 4, 4, 4])
+        assert p.board_tree.root.children
+        assert all(not child.children for child in p.board_tree.root.children)
+
+
+# ── Model registry ─────────────────────────────────────────────────────────────
+
+class TestModelRegistry:
+    def _registry(self, max_size=2):
+        self.loads = []
+        def loader(path, device):
+            self.loads.append(path)
+            return object()
+        return ModelRegistry(loader, max_size=max_size)
+
+    def test_second_lookup_is_cached(self, tmp_path):
+        path = tmp_path / "a.pth"
+        path.write_bytes(b"a")
+        registry = self._registry()
+        assert registry.get(str(path)) is registry.get(str(path))
+        assert len(self.loads) == 1
+
+    def test_reloads_when_file_changes(self, tmp_path):
+        path = tmp_path / "a.pth"
+        path.write_bytes(b"a")
+        registry = self._registry()
+        first = registry.get(str(path))
+        os.utime(path, (0, os.path.getmtime(path) + 10))
+        assert registry.get(str(path)) is not first
+        assert len(self.loads) == 2
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        paths = []
+        for name in ("a", "b", "c"):
+            path = tmp_path / f"{name}.pth"
+            path.write_bytes(name.encode())
+            paths.append(str(path))
+        registry = self._registry(max_size=2)
+        registry.get(paths[0])
+        registry.get(paths[1])
+        registry.get(paths[0])  # a is now most recently used
+        registry.get(paths[2])  # evicts b
+        assert len(registry) == 2
+        registry.get(paths[0])
+        registry.get(paths[1])
+        assert len(self.loads) == 4
+
+
+# ── NumPy inference ────────────────────────────────────────────────────────────
+
+class TestNumpyNeuralEval:
+    def _weights_file(self, tmp_path, output_bias):
+        weights = {
+            "fc1.weight": np.zeros((40, 29)), "fc1.bias": np.zeros(40),
+            "fc2.weight": np.zeros((40, 40)), "fc2.bias": np.zeros(40),
+            "output.weight": np.zeros((1, 40)), "output.bias": np.array([output_bias]),
+        }
+        path = tmp_path / "net.npz"
+        np.savez(path, **weights)
+        return str(path)
+
+    def test_one_score_per_board(self, tmp_path):
+        path = self._weights_file(tmp_path, 0.0)
+        scores = neural_eval_batch([START_BOARD.copy()] * 3, WHITE, path)
+        assert scores == [0.5, 0.5, 0.5]
+
+    def test_output_is_sigmoid_of_bias(self, tmp_path):
+        path = self._weights_file(tmp_path, 2.0)
+        score = neural_eval_batch([START_BOARD.copy()], BLACK, path)[0]
+        assert abs(score - 1 / (1 + np.exp(-2.0))) < 1e-6
+
+    def test_empty_batch(self, tmp_path):
+        path = self._weights_file(tmp_path, 0.0)
+        assert neural_eval_batch([], WHITE, path) == []
+
+
+def _torch_checkpoint(tmp_path, seed=0):
+    """Save a HeuristicNet with seeded random weights and return (model, checkpoint path)."""
+    import pytest
+    torch = pytest.importorskip("torch")
+    from HeuristicNet import HeuristicNet
+    torch.manual_seed(seed)
+    model = HeuristicNet().eval()
+    path = str(tmp_path / "net.pth")
+    torch.save(model.state_dict(), path)
+    return model, path
+
+def _sample_boards(count, seed=0):
+    rng = make_rng(seed, "boards")
+    boards = [START_BOARD.copy()]
+    while len(boards) < count:
+        board = Board(boards[-1])
+        color = WHITE if len(boards) % 2 else BLACK
+        moves = generate_moves(board, roll_dice(rng), color)
+        boards.append(list(moves[rng.randrange(len(moves))][1]) if moves else boards[-1])
+    return boards
+
+
+class TestNumpyTorchParity:
+    def test_exported_weights_match_torch(self, tmp_path):
+        import torch
+        from HeuristicNetNumpy import export_weights
+        model, path = _torch_checkpoint(tmp_path, seed=1)
+        npz_path = export_weights(path, str(tmp_path / "exported.npz"))
+        boards = _sample_boards(6, seed=1)
+        for color in (WHITE, BLACK):
+            turn = 1 if color == WHITE else -1
+            with torch.no_grad():
+                expected = model(torch.tensor([board + [turn] for board in boards], dtype=torch.float32))
+            assert np.allclose(neural_eval_batch(boards, color, npz_path), expected.squeeze(1).numpy(), atol=1e-5)
+
+
+class TestWeightExport:
+    def test_checkpoint_and_weights_written_atomically(self, tmp_path):
+        from HeuristicNet import save_checkpoint
+        model, path = _torch_checkpoint(tmp_path)
+        npz_path = save_checkpoint(model, path)
+        assert os.path.getmtime(npz_path) >= os.path.getmtime(path)
+        assert not [name for name in os.listdir(str(tmp_path)) if name.endswith(".tmp")]
+        with np.load(npz_path) as weights:
+            assert np.allclose(weights["fc1.weight"], model.fc1.weight.detach().numpy())
+
+    def test_stale_weights_are_not_rewritten(self, tmp_path):
+        import pytest
+        from HeuristicNetNumpy import export_weights, resolve_weights
+        _, path = _torch_checkpoint(tmp_path)
+        npz_path = export_weights(path)
+        os.utime(path, (0, os.path.getmtime(npz_path) + 10))
+        before = os.path.getmtime(npz_path)
+        with pytest.warns(UserWarning):
+            assert resolve_weights(path) == npz_path
+        assert os.path.getmtime(npz_path) == before
+
+
+class TestTorchNeuralEval:
+    def test_batch_matches_single_boards(self, tmp_path):
+        import HeuristicNet
+        _, path = _torch_checkpoint(tmp_path)
+        boards = _sample_boards(5)
+        for color in (WHITE, BLACK):
+            single = [HeuristicNet.neural_eval(board, color, path) for board in boards]
+            assert np.allclose(HeuristicNet.neural_eval_batch(boards, color, path), single, atol=1e-6)
+            assert np.allclose(HeuristicNet.neural_eval_batch(boards[2:3], color, path), single[2:3], atol=1e-6)
+
+
+# ── Rollouts ───────────────────────────────────────────────────────────────────
+
+class TestRollout:
+    def test_full_rollout_ends_the_game(self):
+        for policy in ("random", "greedy", "top_k"):
+            assert rollout(START_BOARD, WHITE, policy, None, rng=random.Random(1)) in (0.0, 1.0)
+
+    def test_cutoff_scores_with_heuristic(self):
+        assert rollout(START_BOARD, BLACK, max_plies=0) == evaluate_position(START_BOARD, EVAL_DISTRIBUTION)
+
+    def test_turn_keeps_piece_count(self):
+        rng = random.Random(2)
+        board = Board(START_BOARD)
+        for _ in range(30):
+            board = play_turn(board, (6, 5), WHITE, "top_k", 3, rng)
+            board = play_turn(board, (4, 4, 4, 4), BLACK, "random", 3, rng)
+            white = sum(x for x in board.cells[:24] if x > 0) + board[24] + board[26]
+            black = -sum(x for x in board.cells[:24] if x < 0) + board[25] + board[27]
+            assert white == black == 15
+
+    def test_unknown_policy(self):
+        import pytest
+        with pytest.raises(ValueError):
+            rollout(START_BOARD, WHITE, "bogus")
+
+    def test_greedy_gain_matches_score_change(self):
+        from MoveGenerator import single_die_moves
+        rng = random.Random(3)
+        board, color = Board(START_BOARD), WHITE
+        for _ in range(60):
+            for die in range(1, 7):
+                for move in single_die_moves(board, die, color):
+                    after = greedy_score(board.apply(move, color), color)
+                    assert greedy_gain(board.cells, move, color) == after - greedy_score(board, color)
+            board = play_turn(board, (rng.randint(1, 6), rng.randint(1, 6)), color, "random", 3, rng)
+            color = BLACK if color == WHITE else WHITE
+
+
+class TestMCTSPlayer:
+    def test_plays_legal_move_and_counts_rollouts(self):
+        p = MCTS_Player(BLACK, START_BOARD.copy())
+        move = p.choose_move(START_BOARD.copy(), [3, 1], time=0.2)
+        assert move in p.generate_all_moves(START_BOARD.copy(), [3, 1], current_color=BLACK)
+        assert p.rollouts > 0
+
+    def test_root_parallel_merges_worker_stats(self):
+        p = MCTS_Player(WHITE, START_BOARD.copy(), workers=2)
+        move = p.choose_move(START_BOARD.copy(), [6, 5], time=0.2)
+        tree, chance = p.tree, p.tree.chance_node(p.root, ROLL_INDEX[(5, 6)])
+        assert move in p.generate_all_moves(START_BOARD.copy(), [6, 5])
+        assert tree.visits[p.root] == sum(tree.visits[child] for child in tree.children(chance)) == p.rollouts
+
+    def test_search_keeps_moves_under_their_roll(self):
+        p = MCTS_Player(WHITE, START_BOARD.copy())
+        p.choose_move(START_BOARD.copy(), [6, 5], time=0.3)
+        tree, checked = p.tree, 0
+        for child in tree.children(tree.chance_node(p.root, ROLL_INDEX[(5, 6)])):
+            for chance in tree.children(child):
+                roll = list(ROLLS[tree.roll[chance]][0])
+                legal = p.generate_all_moves(tree.board(child).to_list(), roll, current_color=BLACK)
+                assert all(tree.last_move(grandchild) in legal for grandchild in tree.children(chance))
+                assert tree.visits[chance] == sum(tree.visits[grandchild] for grandchild in tree.children(chance))
+                checked += tree.expanded[chance]
+        assert checked > 0
+
+    def test_reuses_subtree_of_opponent_reply(self):
+        p = MCTS_Player(WHITE, START_BOARD.copy())
+        p.choose_move(START_BOARD.copy(), [6, 5], time=0.2)
+        tree = p.tree
+        chance = next(chance for chance in tree.children(p.last_choice) if tree.expanded[chance])
+        reply = tree.first_child[chance]
+        board, visits = tree.board(reply).to_list(), tree.visits[reply]
+        move = p.choose_move(board, [3, 1], time=0.1)
+        assert p.tree.board(p.root) == board and p.tree.visits[p.root] > visits
+        assert type(p.reuse_ratio) is float and p.reuse_ratio > 0
+        assert move in p.generate_all_moves(board, [3, 1])
+
+    def test_moves_ordered_by_prior(self):
+        p = MCTS_Player(BLACK, START_BOARD.copy())
+        candidates, priors = p.ordered_candidates(Board(START_BOARD), [6, 4], BLACK)
+        assert priors == sorted(priors, reverse=True)
+        assert [1.0 - evaluate_position(board.cells, EVAL_DISTRIBUTION) for _, board in candidates] == priors
+
+    def test_progressive_widening_limits_root_moves(self):
+        p = MCTS_Player(WHITE, START_BOARD.copy(), widening_k=1.0, widening_alpha=0.5)
+        p.choose_move(START_BOARD.copy(), [4, 4, 4, 4], time=0.2)
+        chance = p.tree.chance_node(p.root, ROLL_INDEX[(4, 4, 4, 4)])
+        expanded, visits = p.tree.expanded[chance], p.tree.visits[chance]
+        assert expanded < p.tree.child_count[chance]
+        assert expanded <= max(1, int(np.ceil(visits ** 0.5))) + 1
+
+    def test_neural_leaves_are_evaluated_in_batches(self):
+        model_path = os.path.join(os.path.dirname(__file__), "..", PATH)
+        p = MCTS_Player(WHITE, START_BOARD.copy(), leaf_evaluation="neural", batch_size=8, model_path=model_path)
+        move = p.choose_move(START_BOARD.copy(), [6, 5], time=0.2)
+        assert move in p.generate_all_moves(START_BOARD.copy(), [6, 5])
+        assert not p.pending and p.network_evaluations > p.batches > 0
+        assert p.tree.visits[p.root] == p.network_evaluations + p.rollouts
+        assert 0.0 <= p.tree.value_sum[p.root] / p.tree.visits[p.root] <= 1.0
+
+    def test_fresh_tree_when_position_unknown(self):
+        p = MCTS_Player(WHITE, START_BOARD.copy())
+        p.choose_move(START_BOARD.copy(), [6, 5], time=0.1)
+        p.choose_move(START_BOARD.copy(), [3, 1], time=0.1)
+        assert p.reuse_ratio == 0.0 and p.tree.parent[p.root] == NO_NODE
+
+
+class TestNodeStore:
+    def test_grows_past_capacity(self):
+        store = NodeStore(capacity=4)
+        root = store.add_root(START_BOARD, WHITE)
+        chance = store.chance_node(root, 0)
+        assert len(store) == 22 and store.capacity >= 22
+        assert store.chance_node(root, 0) == chance and store.parent[chance] == root
+
+    def test_moves_are_contiguous_children(self):
+        store = NodeStore()
+        root = store.add_root(START_BOARD, WHITE)
+        chance = store.chance_node(root, ROLL_INDEX[(1, 3)])
+        candidates = generate_moves(START_BOARD, [3, 1], WHITE)
+        store.set_moves(chance, candidates)
+        assert [store.last_move(child) for child in store.children(chance)] == [moves for moves, _ in candidates]
+        assert all(store.color(child) == BLACK for child in store.children(chance))
+
+    def test_ucb_selection(self):
+        store = NodeStore()
+        root = store.add_root(START_BOARD, WHITE)
+        first = store.allocate(3)
+        store.first_child[root], store.child_count[root], store.expanded[root] = first, 3, 3
+        store.parent[first:first + 3] = root
+        store.visits[first:first + 3] = [10, 10, 10]
+        store.value_sum[first:first + 3] = [2.0, 8.0, 5.0]
+        store.visits[root] = 30
+        assert store.best_ucb_child(root, 1.4, 1) == first + 1
+        assert store.best_ucb_child(root, 1.4, -1) == first
+        store.visits[first + 2] = 0
+        assert store.best_ucb_child(root, 1.4, 1) == first + 2
+
+    def test_virtual_loss_resolves_to_backpropagation(self):
+        store = NodeStore()
+        root = store.add_root(START_BOARD, WHITE)
+        chance = store.chance_node(root, ROLL_INDEX[(1, 3)])
+        store.set_moves(chance, generate_moves(START_BOARD, [3, 1], WHITE))
+        child = store.first_child[chance]
+        store.add_virtual_loss(child)
+        assert store.value_sum[child] == 0.0 and store.visits[child] == 1  # a loss for White, who moved
+        store.resolve_virtual_loss(child, 0.8)
+        assert store.visits[root] == 1 and abs(store.value_sum[root] - 0.8) < 1e-9
+        assert abs(store.value_sum[child] - 0.8) < 1e-9
+
+    def test_extract_keeps_subtree_statistics(self):
+        store = NodeStore()
+        root = store.add_root(START_BOARD, WHITE)
+        chance = store.chance_node(root, ROLL_INDEX[(1, 3)])
+        store.set_moves(chance, generate_moves(START_BOARD, [3, 1], WHITE))
+        child = store.first_child[chance]
+        store.backpropagate(child, 0.75)
+        store.backpropagate(store.chance_node(child, 0), 0.25)
+        sub = store.extract(child)
+        assert sub.visits[0] == 2 and sub.value_sum[0] == 1.0 and sub.parent[0] == NO_NODE
+        assert sub.board(0) == store.board(child) and len(sub) == 1 + 21
+
+
+# ── Random streams ─────────────────────────────────────────────────────────────
+
+class TestRandomStreams:
+    def test_same_seed_and_stream_repeat(self):
+        a, b = make_rng(7, 3, "dice"), make_rng(7, 3, "dice")
+        assert [roll_dice(a) for _ in range(50)] == [roll_dice(b) for _ in range(50)]
+
+    def test_streams_are_independent(self):
+        dice = [[roll_dice(make_rng(7, game, "dice")) for _ in range(20)] for game in range(4)]
+        assert all(dice[i] != dice[j] for i in range(4) for j in range(i))
+        assert [roll_dice(make_rng(8, 0, "dice")) for _ in range(20)] != dice[0]
+
+    def test_doubles_are_played_four_times(self):
+        rng = make_rng(1)
+        for _ in range(200):
+            r = roll_dice(rng)
+            assert len(r) == 4 and len(set(r)) == 1 or len(r) == 2 and r[0] != r[1]
+
+    def test_seeded_players_repeat_their_choices(self):
+        def moves(player):
+            return [player.choose_move(START_BOARD.copy(), [6, 3]) for _ in range(10)]
+        assert moves(Random_Player(WHITE, rng=make_rng(5, WHITE))) == moves(Random_Player(WHITE, rng=make_rng(5, WHITE)))
+        a, b = MCTS_Player(WHITE, rng=make_rng(5, WHITE)), MCTS_Player(WHITE, rng=make_rng(5, WHITE))
+        assert [a.get_random_roll() for _ in range(20)] == [b.get_random_roll() for _ in range(20)]
+        assert a.mcts_simulate(a.root) == b.mcts_simulate(b.root)
+
+
+# ── Headless matches ───────────────────────────────────────────────────────────
+
+class TestMatchRunner:
+    def test_seeded_game_repeats(self):
+        a = play_match(RAND_AI, HEUR_AI, seed=11, game_index=2)
+        b = play_match(RAND_AI, HEUR_AI, seed=11, game_index=2)
+        assert a["winner"] in (WHITE, BLACK) and a["moves"] == b["moves"] and a["winner"] == b["winner"]
+        assert play_match(RAND_AI, HEUR_AI, seed=11, game_index=3)["moves"] != a["moves"]
+
+    def test_every_turn_is_legal(self):
+        game = play_match(RAND_AI, RAND_AI, seed=4)
+        board = Board(START_BOARD)
+        for (color, roll, moves), (after, mover) in zip(game["moves"], game["history"]):
+            reachable = [new_board for _, new_board in generate_moves(board, roll, color)] or [board]
+            assert mover == color and Board(after) in reachable
+            board = Board(after)
+        assert len(game["turn_times"]) == len(game["moves"]) and board.to_list() == game["board"]
+        assert board.borne_off(game["winner"]) == 15
+
+    def test_max_turns_and_humans(self):
+        import pytest
+        game = play_match(MCTS_AI, MIN_MAX_AI, seed=1, turn_time=0.01, max_turns=4)
+        assert game["winner"] is None and len(game["moves"]) == 4
+        with pytest.raises(ValueError):
+            play_match(HUMAN, RAND_AI)
+
+    def test_runs_without_tkinter(self):
+        import subprocess
+        code = "import sys, MatchRunner; sys.exit('tkinter' in sys.modules or 'torch' in sys.modules)"
+        assert subprocess.run([sys.executable, "-c", code], cwd=os.path.join(os.path.dirname(__file__), "..")).returncode == 0
+
+
+# ── Tournaments ────────────────────────────────────────────────────────────────
+
+class TestTournament:
+    PLAYERS = [RAND_AI, HEUR_AI, [HEUR_AI, EVAL_DISTRIBUTION], RAND_AI]
+
+    def test_round_robin_plays_every_pair_once(self):
+        pairings = round_robin_pairings(5)
+        assert len(pairings) == 10 and len({frozenset(pair) for pair in pairings}) == 10
+
+    def test_parallel_games_are_all_counted(self):
+        tournament = Tournament(self.PLAYERS, seed=5, workers=2)
+        finished = []
+        scores, winner_idx = tournament.run(on_result=finished.append)
+        assert len(finished) == len(tournament) == 6 and sum(scores) == 6
+        assert scores[winner_idx] == max(scores) and tournament.pool is None
+        assert sorted(result["game_index"] for result in finished) == list(range(6))
+
+    def test_polling_matches_blocking_run(self):
+        scores, _ = Tournament(self.PLAYERS, seed=5, workers=2).run()
+        tournament = Tournament(self.PLAYERS, seed=5, workers=3)
+        tournament.start()
+        while not tournament.is_done():
+            tournament.poll()
+        assert tournament.scores == scores
+
+    def test_failed_game_releases_the_pool(self):
+        import pytest
+        tournament = Tournament([RAND_AI, ["not a player"]], workers=1, games_per_pairing=4)
+        with pytest.raises(ValueError):
+            tournament.run()
+        assert tournament.pool is None and not tournament.futures
+
+        tournament = Tournament([RAND_AI, ["not a player"]], workers=1, games_per_pairing=4)
+        tournament.start()
+        with pytest.raises(ValueError):
+            while not tournament.is_done():
+                tournament.poll()
+        assert tournament.pool is None and not tournament.futures
+
+    def test_rejects_human_players(self):
+        import pytest
+        with pytest.raises(ValueError):
+            Tournament([HUMAN, RAND_AI])
+
+    def test_pairs_alternate_colors(self):
+        schedule = Tournament(self.PLAYERS, games_per_pairing=4).schedule()
+        assert len(schedule) == 24
+        for pairing in round_robin_pairings(4):
+            colors = [(black, white) for game_pairing, black, white in schedule if game_pairing == pairing]
+            assert colors == [pairing, pairing[::-1]] * 2
+
+    def test_stop_rules(self):
+        assert sprt_decision(0, 0) == 0 and sprt_decision(20, 5) == 1 and sprt_decision(5, 20) == -1
+        assert confidence_decision(8, 0) == 0  # fewer than the minimum number of games
+        assert confidence_decision(30, 10) == 1 and confidence_decision(10, 30) == -1
+        assert confidence_decision(22, 18) == 0
+
+    def test_settled_pairing_stops_early(self):
+        tournament = Tournament([RAND_AI, HEUR_AI], seed=1, workers=2, games_per_pairing=100, stop_rule="sprt")
+        scores, winner_idx = tournament.run()
+        assert tournament.decisions == {(0, 1): 1} and winner_idx == 1
+        assert len(tournament.results) == len(tournament) == sum(scores) < 100
+
+
+# ── Ratings ────────────────────────────────────────────────────────────────────
+
+class TestRatingTable:
+    def _table(self, ratings, rds):
+        table = RatingTable()
+        for i, (rating, rd) in enumerate(zip(ratings, rds)):
+            table.add([HEUR_AI, {"bot": i}])
+            table.ratings[i], table.rds[i] = rating, rd
+        return table
+
+    def test_glicko_update_matches_reference_example(self):
+        # Worked example from Glickman's description of the Glicko system
+        table = self._table([1500, 1400, 1550, 1700], [200, 30, 100, 300])
+        table.update([(0, 1, 1.0), (0, 2, 0.0), (0, 3, 0.0)])
+        assert abs(table.ratings[0] - 1464) < 1 and abs(table.rds[0] - 151.4) < 0.5
+        assert table.games[0] == 3 and table.wins[0] == 1
+
+    def test_pairs_uncertain_bots_with_close_opponents(self):
+        table = self._table([1500, 1900, 1520, 1100, 1880], [350, 60, 50, 60, 300])
+        pairs = table.pairings()
+        assert pairs == [(0, 2), (4, 1)]
+        assert len({i for pair in pairs for i in pair}) == 4
+
+    def test_persists_between_runs(self, tmp_path):
+        table = self._table([1600, 1400], [80, 90])
+        table.add(RAND_AI)
+        table.games_played = 12
+        path = str(tmp_path / "ratings.json")
+        table.save(path)
+        loaded = RatingTable.load(path)
+        assert loaded.specs == table.specs and loaded.ratings == table.ratings and loaded.games_played == 12
+        assert loaded.add(RAND_AI) == 2 and len(RatingTable.load(str(tmp_path / "missing.json"))) == 0
+
+    def test_rounds_play_and_rate_games(self):
+        table = RatingTable()
+        for spec in (RAND_AI, HEUR_AI, [HEUR_AI, EVAL_DISTRIBUTION], [HEUR_AI, dict(EVAL_DISTRIBUTION, blots=0.5, prime_structure=0.5)]):
+            table.add(spec)
+        results = table.play_round(seed=2, workers=2)
+        assert len(results) == 2 and table.games_played == 2 and sum(table.games) == 4
+        assert all(rd < 350 for rd in table.rds)
+        for i, j, score in results:
+            assert (table.ratings[i] > table.ratings[j]) == (score == 1.0)
+
+
+# ── Self-play data ─────────────────────────────────────────────────────────────
+
+class TestSelfPlay:
+    def test_records_score_each_side(self):
+        game = play_match(RAND_AI, RAND_AI, seed=6)
+        records = game_records(game["history"], game["winner"], game_id=9)
+        boards, sides, targets = records["board"], records["side"], records["target"]
+        assert boards.shape == (len(game["moves"]), 28) and boards.dtype == np.int8
+        assert boards[-1].tolist() == game["board"]
+        winner_side = 1 if game["winner"] == WHITE else -1
+        assert sides[-1] == winner_side and targets[-1] > 0.5
+        assert np.allclose(targets[sides != winner_side], 1 - targets[-1])
+        assert (records["game_id"] == 9).all() and records["ply"].tolist() == list(range(len(records)))
+
+    def test_writer_rotates_shards(self, tmp_path):
+        writer = ShardWriter(str(tmp_path), "test", records_per_shard=10)
+        for game_id in range(5):
+            writer.add(make_records(np.zeros((4, 28)), np.ones(4), np.zeros(4), game_id))
+        writer.close()
+        assert ready_shards(str(tmp_path)) == writer.shards and writer.records == 20
+        assert [len(read_records(path)) for path in writer.shards] == [12, 8]
+        assert not [name for name in os.listdir(str(tmp_path)) if name.endswith(".tmp")]
+
+    def test_workers_stream_games_for_the_trainer(self, tmp_path):
+        directory = str(tmp_path)
+        count, shards = generate_self_play(6, directory, RAND_AI, RAND_AI, workers=2, seed=3, records_per_shard=100)
+        records = load_shards(ready_shards(directory))
+        assert len(records) == count > 0 and sorted(shards) == ready_shards(directory)
+        assert set(records["side"].tolist()) == {1, -1} and ((records["target"] >= 0) & (records["target"] <= 1)).all()
+        assert set(records["game_id"].tolist()) == set(range(6))
+        mark_consumed(shards, directory)
+        assert ready_shards(directory) == [] and len(load_shards(ready_shards(directory))) == 0
+
+    def test_trainer_consumes_shards(self, tmp_path):
+        from HeuristicNet import shard_training
+        from HeuristicNetNumpy import weights_path
+        _, model_path = _torch_checkpoint(tmp_path)
+        directory = str(tmp_path / "shards")
+        writer = ShardWriter(directory, "test", records_per_shard=10)
+        writer.add(make_records(np.zeros((10, 28)), np.ones(10), np.full(10, 0.75), 0))
+        assert shard_training(directory, model_path, epochs=1, batch_size=5, min_records=20) == 0
+        assert shard_training(directory, model_path, epochs=1, batch_size=5, min_records=10) == 10
+        assert ready_shards(directory) == [] and os.path.exists(weights_path(model_path))
+        assert not [name for name in os.listdir(str(tmp_path)) if name.endswith(".tmp")]
+
+    def test_uneven_split_plays_every_game_once(self, tmp_path):
+        directory = str(tmp_path)
+        generate_self_play(5, directory, RAND_AI, RAND_AI, workers=2, seed=3, records_per_shard=1000)
+        records = load_shards(ready_shards(directory))
+        assert sorted(records["game_id"][records["ply"] == 0].tolist()) == list(range(5))
+
+
+# ── Position records ───────────────────────────────────────────────────────────
+
+class TestPositionRecords:
+    def test_fixed_width_layout(self):
+        assert RECORD_DTYPE.itemsize == 28 + 1 + 4 + 4 + 2
+
+    def test_round_trip_through_memory_map(self, tmp_path):
+        path = str(tmp_path / "positions.bgr")
+        boards = np.array([START_BOARD, [-x for x in START_BOARD]], dtype=np.int8)
+        write_records(path, make_records(boards, [1, -1], [0.25, 0.75], game_id=123456))
+        assert os.path.getsize(path) == 8 + 2 * RECORD_DTYPE.itemsize
+        records = read_records(path)
+        assert isinstance(records, np.memmap) and not records.flags.writeable
+        assert records["board"].tolist() == boards.tolist() and records["side"].tolist() == [1, -1]
+        assert records["target"].tolist() == [0.25, 0.75] and records["game_id"].tolist() == [123456] * 2
+        assert records["ply"].tolist() == [0, 1]
+        assert network_inputs(records).tolist() == [START_BOARD + [1], [-x for x in START_BOARD] + [-1]]
+
+    def test_empty_and_foreign_files(self, tmp_path):
+        path = str(tmp_path / "empty.bgr")
+        write_records(path, make_records(np.zeros((0, 28)), [], [], 0))
+        assert len(read_records(path)) == 0
+        other = tmp_path / "other.bgr"
+        other.write_bytes(b"not a record file")
+        import pytest
+        with pytest.raises(ValueError):
+            read_records(str(other))